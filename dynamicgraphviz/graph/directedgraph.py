@@ -10,7 +10,6 @@ of the graphs.
 
 
 from dynamicgraphviz.graph.graph import _Graph, _Node, _Link
-from itertools import chain
 from dynamicgraphviz.exceptions.graph_errors import *
 
 __author__ = "Dimitri Watel"
@@ -44,6 +43,8 @@ class DirectedGraph(_Graph):
 
     def __init__(self):
         super().__init__(directed=True)
+        self.__str = None
+        self.__str_version = None
 
     def __contains__(self, elem):
         """Return True if elem is a node or an arc of the graph."""
@@ -61,14 +62,10 @@ class DirectedGraph(_Graph):
     def _build_link(self, u, v):
         return Arc(self, u, v), DirectedNode._add_incident_arc
 
-    @property
-    def nb_arcs(self):
-        return super().nb_links
+    # The getters of _Graph are reused directly, calling them through super() would double the cost of an access.
+    nb_arcs = property(_Graph.nb_links.fget, doc="""Return the number of arcs of the graph.""")
 
-    @property
-    def arcs(self):
-        """Return an iterator through the list of arcs of the graph"""
-        return super().links
+    arcs = property(_Graph.links.fget, doc="""Return an iterator through the list of arcs of the graph""")
 
     def add_arc(self, u, v):
         """Add an arc to the graph from the node u to the node v and return it.
@@ -85,6 +82,21 @@ class DirectedGraph(_Graph):
         """
         return super()._add_link(u, v)
 
+    def add_arcs(self, couples):
+        """Add an arc to the graph from u to v for each couple of nodes (u, v) of couples and return them.
+
+        Add an arc from u to v for each couple (u, v) of couples, in order. This is equivalent to calling `add_arc` for
+        each couple but faster for large numbers of arcs. If a couple is not valid, an exception is raised and the arcs
+        of the previous couples remain in the graph.
+        :param couples: an iterable of couples of nodes of the graph
+        :return: the list of the new arcs, in the order of couples.
+        :raises TypeError: if a couple contains an element that is not a node
+        :raises NodeMembershipError: if a couple contains a node that does not belong to the graph
+        :raises GraphError: if a couple contains twice the same node
+        :raises LinkError: if there is already an arc from the first node of a couple to the second one.
+        """
+        return super()._add_links(couples)
+
     def remove_arc(self, a):
         """Remove an arc of the graph.
 
@@ -96,9 +108,37 @@ class DirectedGraph(_Graph):
         """
         return self._remove_link(a)
 
+    def common_output_neighbors_matrix(self):
+        """Return the matrix of the number of common output neighbors of each couple of nodes.
+
+        Return a list of lists m such that, if u and v are respectively the i-th and the j-th nodes of the graph,
+        m[i][j] is the number of nodes that are output neighbors of both u and v. In particular, m[i][i] is the number of
+        output neighbors of u.
+        """
+        # The row of a node is the bitset of its output neighbors, built for this call only: the bit number i is set if
+        # the i-th node is an output neighbor.
+        position = {v: i for i, v in enumerate(self)}
+        rows = [sum(1 << position[w] for w in v.output_neighbors) for v in self]
+        return [[_popcount(row & row2) for row2 in rows] for row in rows]
+
     def __str__(self):
-        return '\n'.join(' '.join([('1' if node2.is_output_neighbor_of(node) else '0') for node2 in self]) for node
-                         in self)
+        # The string is cached until the next edit of the graph.
+        if self.__str_version == self._version:
+            return self.__str
+
+        # Each row is filled from the output neighbors of its node, which takes O(V + E) steps instead of testing every
+        # couple of nodes. Separators are inserted with str.replace, which runs at C speed instead of joining one
+        # character at a time.
+        position = {v: i for i, v in enumerate(self)}
+        lines = []
+        for v in self:
+            row = bytearray(b'0') * len(position)
+            for w in v.output_neighbors:
+                row[position[w]] = ord('1')
+            lines.append(row.decode().replace('', ' ')[1:-1])
+        self.__str = '\n'.join(lines)
+        self.__str_version = self._version
+        return self.__str
 
 
 class DirectedNode(_Node):
@@ -120,16 +160,21 @@ class DirectedNode(_Node):
     is printed with `str`. That index is accessible with the property `index`.
     """
 
+    __slots__ = ('__neighbors', '__input_arcs', '__output_arcs', '__incident_arcs')
+
     def __init__(self, g):
         """Build a new node of the directed graph g."""
         super().__init__(g)
-        self.__neighbors = set()
+        self.__neighbors = {}
+        """Associate each neighbor with the number of arcs between that neighbor and this node (1 or 2)."""
         self.__input_arcs = {}
         self.__output_arcs = {}
+        self.__incident_arcs = None
+        """List of the output arcs followed by the input arcs of the node, or None if it should be rebuilt."""
 
     def __len__(self):
         """Return the number of neighbors of the node."""
-        return self.nb_neighbors
+        return len(self.__neighbors)
 
     @property
     def nb_input_neighbors(self):
@@ -184,6 +229,41 @@ class DirectedNode(_Node):
         """Return True if this node is an input or an output neighbor of this node and False otherwise."""
         return v in self.__neighbors
 
+    def nb_common_input_neighbors(self, v):
+        """Return the number of nodes that are input neighbors of both this node and the node v.
+
+        Return the number of nodes that are input neighbors of both this node and the node v. The node v should be a
+        node of the same graph, otherwise an exception is raised.
+
+        :param v: a node of the graph of this node
+        :raises TypeError: if v is not a node of a directed graph
+        :raises NodeMembershipError: if v is not a node of the graph of this node
+        :return: the number of common input neighbors of this node and v
+        """
+        self.__check_same_graph(v)
+        return _nb_common_keys(self.__input_arcs, v.__input_arcs)
+
+    def nb_common_output_neighbors(self, v):
+        """Return the number of nodes that are output neighbors of both this node and the node v.
+
+        Return the number of nodes that are output neighbors of both this node and the node v. The node v should be a
+        node of the same graph, otherwise an exception is raised.
+
+        :param v: a node of the graph of this node
+        :raises TypeError: if v is not a node of a directed graph
+        :raises NodeMembershipError: if v is not a node of the graph of this node
+        :return: the number of common output neighbors of this node and v
+        """
+        self.__check_same_graph(v)
+        return _nb_common_keys(self.__output_arcs, v.__output_arcs)
+
+    def __check_same_graph(self, v):
+        """Raise an exception if v is not a node of the graph of this node."""
+        if not isinstance(v, DirectedNode):
+            raise TypeError()
+        if v._graph is not self._graph:
+            raise NodeMembershipError(self._graph, v)
+
     def _remove_neighbor(self, v):
         """Remove the node v from the list of neighbors of the node.
 
@@ -195,21 +275,15 @@ class DirectedNode(_Node):
         :raises NodeError: if v is not a neighbor of the node
         """
 
-        try:
-            self.__neighbors.remove(v)
-            try:
-                self._remove_input_neighbor(v)
-            except NodeError:
-                pass
-            try:
-                self._remove_output_neighbor(v)
-            except NodeError:
-                pass
-        except KeyError:
-            if isinstance(v, DirectedGraph):
+        if v not in self.__neighbors:
+            if isinstance(v, DirectedNode):
                 raise NodeError(self._graph, self, 'The node ' + str(v) + ' is not a neighbor of this node.')
             else:
                 raise TypeError()
+        if v in self.__input_arcs:
+            self._remove_input_neighbor(v)
+        if v in self.__output_arcs:
+            self._remove_output_neighbor(v)
 
     def _remove_input_neighbor(self, v):
         """Remove the node v from the list of input neighbors of the node.
@@ -221,15 +295,13 @@ class DirectedNode(_Node):
         :raises TypeError: if v is not a node of an directed graph
         :raises NodeError: if v is not an input neighbor of the node
         """
-        try:
-            del self.__input_arcs[v]
-            if not self.is_input_neighbor_of(v):
-                self.__neighbors.remove(v)
-        except KeyError:
-            if isinstance(v, DirectedGraph):
+        if self.__input_arcs.pop(v, None) is None:
+            if isinstance(v, DirectedNode):
                 raise NodeError(self._graph, self, 'The node ' + str(v) + ' is not an input neighbor of this node.')
             else:
                 raise TypeError()
+        self.__incident_arcs = None
+        self.__unref_neighbor(v)
 
     def _remove_output_neighbor(self, v):
         """Remove the node v from the list of output neighbors of the node.
@@ -241,15 +313,22 @@ class DirectedNode(_Node):
         :raises TypeError: if v is not a node of an directed graph
         :raises NodeError: if v is not an output neighbor of the node
         """
-        try:
-            del self.__output_arcs[v]
-            if not self.is_output_neighbor_of(v):
-                self.__neighbors.remove(v)
-        except KeyError:
-            if isinstance(v, DirectedGraph):
+        if self.__output_arcs.pop(v, None) is None:
+            if isinstance(v, DirectedNode):
                 raise NodeError(self._graph, self, 'The node ' + str(v) + ' is not an output neighbor of this node.')
             else:
                 raise TypeError()
+        self.__incident_arcs = None
+        self.__unref_neighbor(v)
+
+    def __unref_neighbor(self, v):
+        """Decrease the number of arcs between the neighbor v and this node, and remove v from the neighbors if there
+        is no more arc."""
+        count = self.__neighbors[v] - 1
+        if count == 0:
+            del self.__neighbors[v]
+        else:
+            self.__neighbors[v] = count
 
     @property
     def input_arcs(self):
@@ -263,8 +342,11 @@ class DirectedNode(_Node):
 
     @property
     def incident_arcs(self):
-        """Return an iterator through the list of incident edges of the node."""
-        return chain(self.output_arcs, self.input_arcs)
+        """Return an iterator through the list of incident arcs of the node."""
+        if self.__incident_arcs is None:
+            self.__incident_arcs = list(self.__output_arcs.values())
+            self.__incident_arcs.extend(self.__input_arcs.values())
+        return iter(self.__incident_arcs)
 
     def get_input_arc(self, v):
         """Return the arc from the node v to this node.
@@ -315,56 +397,71 @@ class DirectedNode(_Node):
         :raises NodeError: if v is not a neighbor of the node
         :return: the arc between the node and v
         """
-        try:
-            return self.get_input_arc(v)
-        except TypeError:
-            raise
-        except NodeError:
+        a = self.get_input_arc_or_none(v)
+        if a is None:
             return self.get_output_arc(v)
+        return a
+
+    def get_input_arc_or_none(self, v):
+        """Return the arc from the node v to this node, or None if there is no such arc.
+
+        Return the arc from the node v to this node, or None if v is not an input neighbor of the node. Unlike
+        `is_output_neighbor_of` followed by `get_input_arc`, this method looks for the arc only once.
+
+        :param v: a node
+        :return: the arc from v to this node, or None.
+        """
+        return self.__input_arcs.get(v)
+
+    def get_output_arc_or_none(self, v):
+        """Return the arc from this node to the node v, or None if there is no such arc.
+
+        Return the arc from this node to the node v, or None if v is not an output neighbor of the node. Unlike
+        `is_input_neighbor_of` followed by `get_output_arc`, this method looks for the arc only once.
+
+        :param v: a node
+        :return: the arc from this node to v, or None.
+        """
+        return self.__output_arcs.get(v)
 
     def is_input_arc(self, a):
         """Return True if the arc a enters the node and False otherwise."""
-        return a in self.__input_arcs.values()
+        return isinstance(a, Arc) and a._v is self and self.__input_arcs.get(a._u) is a
 
     def is_output_arc(self, a):
         """Return True if the arc a goes out of the node and False otherwise."""
-        return a in self.__output_arcs.values()
+        return isinstance(a, Arc) and a._u is self and self.__output_arcs.get(a._v) is a
 
     def is_incident_to(self, a):
         """Return True if the node is incident to the arc a and False otherwise."""
         return self.is_input_arc(a) or self.is_output_arc(a)
 
-    def _add_incident_arc(self, a):
-        """Add the arc a to the list of input or output arcs of this node (and the corresponding neighbor to the list
-        of neighbors) depending whether the node is the input or the output node of a.
+    def _add_incident_arc(self, a, v):
+        """Add the arc a to the list of input or output arcs of this node (and the neighbor v to the list of neighbors)
+        depending whether the node is the input or the output node of a.
 
-        Add the arc a to the list of input or output arcs of this node (and the corresponding neighbor to the list
-        of neighbors) depending whether the node is the input or the output node of a. If the node is not an extremity
-        of a, an exception is raised. If a is not an arc, an unexpected behaviour may occurs.
+        Add the arc a to the list of input or output arcs of this node (and the neighbor v to the list of neighbors)
+        depending whether the node is the input or the output node of a. The node v should be the other extremity of
+        a. If the node is not an extremity of a or if a is not an arc, an exception is raised.
 
         :param a: the arc to be added.
+        :param v: the extremity of a that is not this node.
         :raises TypeError: if a is not an arc.
         :raises LinkError: if the node is not an extremity of a.
         """
 
-        try:
-            u, v = a.extremities
-            if u == self:
-                self.__output_arcs[v] = a
-                self.__neighbors.add(v)
-            elif v == self:
-                self.__input_arcs[u] = a
-                self.__neighbors.add(u)
-            else:
-                if not isinstance(a, Arc):
-                    raise TypeError()
-                else:
-                    raise LinkError(self._graph, a, str(self) + ' is not one of the extremities.')
-        except AttributeError:
-            if not isinstance(a, Arc):
-                raise TypeError()
-            else:
-                raise
+        if not isinstance(a, Arc):
+            raise TypeError()
+        if a._u is self:
+            self.__incident_arcs = None
+            self.__output_arcs[v] = a
+            self.__neighbors[v] = self.__neighbors.get(v, 0) + 1
+        elif a._v is self:
+            self.__incident_arcs = None
+            self.__input_arcs[v] = a
+            self.__neighbors[v] = self.__neighbors.get(v, 0) + 1
+        else:
+            raise LinkError(self._graph, a, str(self) + ' is not one of the extremities.')
 
     def _remove_incident_arc(self, a):
         """Remove the arc a from the list of input or output arcs of this node (and the corresponding neighbor from
@@ -379,21 +476,14 @@ class DirectedNode(_Node):
         :raises LinkError: if the node is not an extremity of a.
         """
 
-        try:
-            u, v = a.extremities
-            if u == self:
-                self._remove_output_neighbor(v)
-            elif v == self:
-                self._remove_input_neighbor(u)
-            else:
-                if not isinstance(a, Arc):
-                    raise TypeError()
-                else:
-                    raise LinkError(self._graph, a, str(self) + ' is not one of the extremities.')
-        except NodeError:
-            raise
-        except TypeError:
-            raise
+        if not isinstance(a, Arc):
+            raise TypeError()
+        if a._u is self:
+            self._remove_output_neighbor(a._v)
+        elif a._v is self:
+            self._remove_input_neighbor(a._u)
+        else:
+            raise LinkError(self._graph, a, str(self) + ' is not one of the extremities.')
 
 
 class Arc(_Link):
@@ -410,6 +500,8 @@ class Arc(_Link):
     this case, it always returns True.
     """
 
+    __slots__ = ()
+
     @property
     def extremities(self):
         """Return the two extremities of the arc.
@@ -452,3 +544,16 @@ class Arc(_Link):
 
     def __repr__(self):
         return str(self)
+
+
+def _nb_common_keys(d1, d2):
+    """Return the number of keys of the dict d1 that are also keys of the dict d2, looking up the keys of the smallest
+    one in the other."""
+    if len(d1) > len(d2):
+        d1, d2 = d2, d1
+    return sum(1 for key in d1 if key in d2)
+
+
+def _popcount(x):
+    """Return the number of bits equal to 1 in the binary representation of the non negative integer x."""
+    return bin(x).count('1')
@@ -51,10 +51,94 @@ class _Graph:
         Build a new graph with no node (and thus no edge or arc).
         :param directed: Determine whether the graph is directed or not.
         """
-        self.__nodes = []
-        self.__links = []
+        # Dicts are used as insertion-ordered sets (every value is None)
+        self.__nodes = {}
+        self.__links = {}
         self.__directed = directed
 
+        self._version = 0
+        """Number of edits of the graph, used to know if a cached representation of the graph is outdated."""
+
+        self._scratch = []
+        """List reused by `remove_node` to copy the incident edges of a node instead of allocating a new list."""
+
+        # Topics of the messages published when the graph is edited. As id(self) is constant, they are built once.
+        gid = str(id(self))
+        self._topic_graph = gid
+        self._topic_add_node = gid + '.add_node'
+        self._topic_remove_node = gid + '.remove_node'
+        self._topic_add_arc = gid + '.add_arc'
+        self._topic_remove_arc = gid + '.remove_arc'
+
+        # Callbacks registered with the `on_*` methods, called directly when the graph is edited
+        self._on_add_node = []
+        self._on_remove_node = []
+        self._on_add_arc = []
+        self._on_remove_arc = []
+
+    def on_add_node(self, callback):
+        """Register a function called with the arguments (node, draw) each time a node is added to the graph.
+
+        This is a faster alternative to subscribing to the pubsub topic str(id(self)) + '.add_node', which still
+        receives the same messages.
+        """
+        self._on_add_node.append(callback)
+
+    def on_remove_node(self, callback):
+        """Register a function called with the arguments (node, draw) each time a node is removed from the graph.
+
+        This is a faster alternative to subscribing to the pubsub topic str(id(self)) + '.remove_node', which still
+        receives the same messages.
+        """
+        self._on_remove_node.append(callback)
+
+    def on_add_arc(self, callback):
+        """Register a function called with the arguments (arc, draw) each time an edge or an arc is added to the graph.
+
+        This is a faster alternative to subscribing to the pubsub topic str(id(self)) + '.add_arc', which still
+        receives the same messages.
+        """
+        self._on_add_arc.append(callback)
+
+    def on_remove_arc(self, callback):
+        """Register a function called with the arguments (arc, draw) each time an edge or an arc is removed from the
+        graph.
+
+        This is a faster alternative to subscribing to the pubsub topic str(id(self)) + '.remove_arc', which still
+        receives the same messages.
+        """
+        self._on_remove_arc.append(callback)
+
+    def remove_callback(self, callback):
+        """Unregister the function callback from every list of functions called when the graph is edited.
+
+        The function stops being called on the edits of the graph it was registered for with `on_add_node`,
+        `on_remove_node`, `on_add_arc` or `on_remove_arc`. The graph does not keep any reference to it any more. Nothing
+        is done if the function was not registered. The lists are replaced rather than modified, so that a callback
+        can be unregistered while the graph calls the callbacks.
+        """
+        self._on_add_node = [c for c in self._on_add_node if c != callback]
+        self._on_remove_node = [c for c in self._on_remove_node if c != callback]
+        self._on_add_arc = [c for c in self._on_add_arc if c != callback]
+        self._on_remove_arc = [c for c in self._on_remove_arc if c != callback]
+
+    def __publish(self, topic, **msg_data):
+        """Publish a message with the topic topic and the data msg_data, unless no listener would receive it.
+
+        A message is received by the listeners of its topic and of the parent topics, that is the topic of the graph
+        and the root topic. Checking them is much cheaper than publishing, which matters when the graph is used without
+        any drawer.
+        """
+        topic_mgr = pub.getDefaultTopicMgr()
+        for name in (topic, self._topic_graph):
+            topic_obj = topic_mgr.getTopic(name, okIfNone=True)
+            if topic_obj is not None and topic_obj.hasListeners():
+                break
+        else:
+            if not topic_mgr.getRootAllTopics().hasListeners():
+                return
+        pub.sendMessage(topic, **msg_data)
+
     def __len__(self):
         """Return the number of nodes of the graph."""
         return len(self.__nodes)
@@ -100,10 +184,13 @@ class _Graph:
         :return the new added node.
         """
         node = self._build_node()
-        self.__nodes.append(node)
+        self.__nodes[node] = None
+        self._version += 1
 
         # Publish a message so that any listener is aware that a node was added
-        pub.sendMessage(str(id(self)) + '.add_node', node=node, draw=True)
+        for callback in self._on_add_node:
+            callback(node, True)
+        self.__publish(self._topic_add_node, node=node, draw=True)
         return node
 
     def remove_node(self, v):
@@ -117,20 +204,34 @@ class _Graph:
         :raises NodeMembershipError: if v does not belong to the graph.
         """
         try:
-            self.__nodes.remove(v)
-            for arc in (list(v.incident_edges) if not self.directed else list(v.incident_arcs)):
+            del self.__nodes[v]
+        except KeyError:
+            self.__raise_bad_node(v)
+
+        self._version += 1
+        # The incident arcs of a directed node are iterated from a list that is replaced, not modified, when an arc is
+        # removed, so there is no need to copy them. The incident edges of an undirected node are iterated from its
+        # dict of edges, that is modified, so they are copied in the scratch list of the graph. A new list is used if
+        # the scratch list is in use, when a listener removes a node during the removal of another one.
+        if self.directed:
+            links = v.incident_arcs
+        else:
+            links = self._scratch if not self._scratch else []
+            links.extend(v.incident_edges)
+        try:
+            for arc in links:
                 # Remove the incident edges or arcs of the nodes. Any listener will be aware that those edges/arcs
-                # are removed. If the listener draws the graphs, the False parameter tells it not to immediately update
-                # the drawing, it will be done when the node is removed.
+                # are removed. If the listener draws the graphs, the False parameter tells it not to immediately
+                # update the drawing, it will be done when the node is removed.
                 self.__remove_link(arc, False)
+        finally:
+            if links is self._scratch:
+                links.clear()
 
-            # Publish a message so that any listener is aware that a node was removed
-            pub.sendMessage(str(id(self)) + '.remove_node', node=v, draw=True)
-        except ValueError:
-            if isinstance(v, _Node):
-                raise NodeMembershipError(self, v)
-            else:
-                raise TypeError()
+        # Publish a message so that any listener is aware that a node was removed
+        for callback in self._on_remove_node:
+            callback(v, True)
+        self.__publish(self._topic_remove_node, node=v, draw=True)
 
     def _add_link(self, u, v):
         """Add an edge or an arc to the graph and return it.
@@ -150,34 +251,62 @@ class _Graph:
         :raises LinkError: if the graph is undirected and if there is already an edge between u and v or if the graph is
         directed and there is already an arc from u to v.
         """
-        if u not in self:
-            if isinstance(u, _Node):
-                raise NodeMembershipError(self, u)
-            else:
-                raise TypeError()
-
-        if v not in self:
-            if isinstance(v, _Node):
-                raise NodeMembershipError(self, v)
-            else:
-                raise TypeError()
-
-        if u == v:
+        if u not in self.__nodes:
+            self.__raise_bad_node(u)
+        if v not in self.__nodes:
+            self.__raise_bad_node(v)
+        return self.__add_link(u, v)
+
+    def _add_links(self, couples):
+        """Add an edge or an arc to the graph for each couple of nodes (u, v) of couples and return them.
+
+        Add an edge or an arc between u and v for each couple (u, v) of couples, in order, as `_add_link` would do.
+        This method is faster than calling `_add_link` for each couple. If a couple is not valid, the exception
+        `_add_link` would raise is raised and the links of the previous couples remain in the graph.
+
+        :param couples: an iterable of couples of nodes of the graph
+        :return: the list of the new edges or arcs, in the order of couples.
+        :raises TypeError: if a couple contains an element that is not a node
+        :raises NodeMembershipError: if a couple contains a node that does not belong to the graph
+        :raises GraphError: if a couple contains twice the same node
+        :raises LinkError: if the graph is undirected and if there is already an edge between the nodes of a couple or
+        if the graph is directed and there is already an arc from the first node of a couple to the second one.
+        """
+        nodes = self.__nodes
+        links = []
+        for u, v in couples:
+            if u not in nodes:
+                self.__raise_bad_node(u)
+            if v not in nodes:
+                self.__raise_bad_node(v)
+            links.append(self.__add_link(u, v))
+        return links
+
+    def __add_link(self, u, v):
+        """Add an edge or an arc between the nodes u and v of the graph and return it.
+
+        Same as `_add_link` except that u and v are assumed to be nodes of the graph.
+        """
+        if u is v:
             raise GraphError(self, 'A node cannot be linked to itself.')
 
-        if self.directed and u.is_input_neighbor_of(v):
-            raise LinkError(self, u.get_output_arc(v), 'The arc already exists.')
-
-        if not self.directed and u.is_neighbor_of(v):
+        if self.directed:
+            link = u.get_output_arc_or_none(v)
+            if link is not None:
+                raise LinkError(self, link, 'The arc already exists.')
+        elif u.is_neighbor_of(v):
             raise LinkError(self, u.get_incident_edge(v), 'The edge already exists.')
 
         link, met = self._build_link(u, v)
-        met(u, link)
-        met(v, link)
-        self.__links.append(link)
+        met(u, link, v)
+        met(v, link, u)
+        self.__links[link] = None
+        self._version += 1
 
         # Publish a message so that any listener is aware that an arc was added
-        pub.sendMessage(str(id(self)) + '.add_arc', arc=link, draw=True)
+        for callback in self._on_add_arc:
+            callback(link, True)
+        self.__publish(self._topic_add_arc, arc=link, draw=True)
         return link
 
     def __remove_link(self, l, draw=False):
@@ -192,24 +321,46 @@ class _Graph:
         :raises LinkMembershipError: if the link l does not belong to the graph.
         """
         try:
-            self.__links.remove(l)
-            u, v = l.extremities
-            if self.directed:
-                u._remove_incident_arc(l)
-                v._remove_incident_arc(l)
-            else:
-                u._remove_incident_edge(l)
-                v._remove_incident_edge(l)
-
-            # Publish a message so that any listener is aware that an arc was removed.
-            # The draw parameters tells any drawer listener not to update the drawing.
-            pub.sendMessage(str(id(self)) + '.remove_arc', arc=l, draw=draw)
-
-        except ValueError:
-            if isinstance(l, _Link):
-                raise LinkMembershipError(self, l)
-            else:
-                raise TypeError()
+            del self.__links[l]
+        except KeyError:
+            self.__raise_bad_link(l)
+
+        self._version += 1
+        u, v = l.extremities
+        if self.directed:
+            u._remove_incident_arc(l)
+            v._remove_incident_arc(l)
+        else:
+            u._remove_incident_edge(l, v)
+            v._remove_incident_edge(l, u)
+
+        # Publish a message so that any listener is aware that an arc was removed.
+        # The draw parameters tells any drawer listener not to update the drawing.
+        for callback in self._on_remove_arc:
+            callback(l, draw)
+        self.__publish(self._topic_remove_arc, arc=l, draw=draw)
+
+    def __raise_bad_node(self, v):
+        """Raise the exception explaining why v, that does not belong to the graph, was given instead of a node of the
+        graph.
+
+        :raises TypeError: if v is not a node.
+        :raises NodeMembershipError: if v is a node that does not belong to the graph.
+        """
+        if isinstance(v, _Node):
+            raise NodeMembershipError(self, v)
+        raise TypeError()
+
+    def __raise_bad_link(self, l):
+        """Raise the exception explaining why l, that does not belong to the graph, was given instead of a link of the
+        graph.
+
+        :raises TypeError: if l is not an edge or an arc.
+        :raises LinkMembershipError: if l is an edge or an arc that does not belong to the graph.
+        """
+        if isinstance(l, _Link):
+            raise LinkMembershipError(self, l)
+        raise TypeError()
 
     def _remove_link(self, l):
         """Remove an edge or an arc of the graph.
@@ -236,6 +387,8 @@ class _Node:
     node and that is used when the node is printed with `str`.
     """
 
+    __slots__ = ('_graph', '__index', '__weakref__')
+
     _index = 1
     """Index of the next added node of the graph."""
 
@@ -269,6 +422,8 @@ class _Link:
     `neighbor`. Finally use the property `directed` to know whether the link is an edge or an arc.
     """
 
+    __slots__ = ('_graph', '_u', '_v', '__weakref__')
+
     def __init__(self, g, u, v):
         """Build a new link between the node u and the node v
 
@@ -295,9 +450,9 @@ class _Link:
         :raise LinkError: if the node v is not an extremity of the link
         :return: the extremity not equal to v.
         """
-        if v == self._u:
+        if v is self._u:
             return self._v
-        elif v == self._v:
+        elif v is self._v:
             return self._u
         if isinstance(v, _Node):
             raise LinkError(self._graph, self, str(v) + " is not an extremity of the link.")
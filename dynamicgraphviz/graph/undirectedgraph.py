@@ -61,14 +61,10 @@ class UndirectedGraph(_Graph):
     def _build_link(self, u, v):
         return Edge(self, u, v), UndirectedNode._add_incident_edge
 
-    @property
-    def nb_edges(self):
-        return super().nb_links
+    # The getters of _Graph are reused directly, calling them through super() would double the cost of an access.
+    nb_edges = property(_Graph.nb_links.fget, doc="""Return the number of edges of the graph.""")
 
-    @property
-    def edges(self):
-        """Return an iterator through the list of edges of the graph"""
-        return super().links
+    edges = property(_Graph.links.fget, doc="""Return an iterator through the list of edges of the graph""")
 
     def add_edge(self, u, v):
         """Add an edge to the graph and return it.
@@ -85,6 +81,21 @@ class UndirectedGraph(_Graph):
         """
         return super()._add_link(u, v)
 
+    def add_edges(self, couples):
+        """Add an edge to the graph between u and v for each couple of nodes (u, v) of couples and return them.
+
+        Add an edge between u and v for each couple (u, v) of couples, in order. This is equivalent to calling
+        `add_edge` for each couple but faster for large numbers of edges. If a couple is not valid, an exception is
+        raised and the edges of the previous couples remain in the graph.
+        :param couples: an iterable of couples of nodes of the graph
+        :return: the list of the new edges, in the order of couples.
+        :raises TypeError: if a couple contains an element that is not a node
+        :raises NodeMembershipError: if a couple contains a node that does not belong to the graph
+        :raises GraphError: if a couple contains twice the same node
+        :raises LinkError: if there is already an edge between the nodes of a couple.
+        """
+        return super()._add_links(couples)
+
     def remove_edge(self, e):
         """Remove an edge e of the graph.
 
@@ -97,7 +108,16 @@ class UndirectedGraph(_Graph):
         return self._remove_link(e)
 
     def __str__(self):
-        return '\n'.join(' '.join([('1' if node2.is_neighbor_of(node) else '0') for node2 in self]) for node in self)
+        # Each row is filled from the neighbors of its node, which takes O(V + E) steps instead of testing every
+        # couple of nodes. Separators are inserted with str.replace, which runs at C speed.
+        position = {node: i for i, node in enumerate(self)}
+        lines = []
+        for node in self:
+            row = bytearray(b'0') * len(position)
+            for neighbor in node.neighbors:
+                row[position[neighbor]] = ord('1')
+            lines.append(row.decode().replace('', ' ')[1:-1])
+        return '\n'.join(lines)
 
 
 class UndirectedNode(_Node):
@@ -116,6 +136,8 @@ class UndirectedNode(_Node):
     is printed with `str`. That index is accessible with the property `index`.
     """
 
+    __slots__ = ('__edges',)
+
     def __init__(self, g):
         """Build a new node of the undirected graph g."""
         super().__init__(g)
@@ -123,7 +145,7 @@ class UndirectedNode(_Node):
 
     def __len__(self):
         """Return the number of neighbors of the node."""
-        return self.nb_neighbors
+        return len(self.__edges)
 
     @property
     def nb_neighbors(self):
@@ -148,9 +170,7 @@ class UndirectedNode(_Node):
         :raises TypeError: if v is not a node of an undirected graph
         :raises NodeError: if v is not a neighbor of the node
         """
-        try:
-            del self.__edges[v]
-        except KeyError:
+        if self.__edges.pop(v, None) is None:
             if isinstance(v, UndirectedNode):
                 raise NodeError(self._graph, self, 'The node ' + str(v) + ' is not a neighbor of this node.')
             else:
@@ -185,58 +205,45 @@ class UndirectedNode(_Node):
         """Return True if the node is incident to the edge e and False otherwise."""
         return e in self.__edges.values()
 
-    def _add_incident_edge(self, e):
-        """Add the edge e to the list of incident edges of this node (and the corresponding neighbor to the list
-        of neighbors).
+    def _add_incident_edge(self, e, v):
+        """Add the edge e to the list of incident edges of this node (and the neighbor v to the list of neighbors).
 
-        Add the edge e to the list of incident edges of this node (and the corresponding neighbor to the list
-        of neighbors). If the node is not an extremity of e, an exception is raised. If e is not an edge,
-        an unexpected behaviour may occurs.
+        Add the edge e to the list of incident edges of this node (and the neighbor v to the list of neighbors). The
+        node v should be the other extremity of e, as given by the graph. If the node is not an extremity of e or if e
+        is not an edge, an exception is raised, unless Python runs with the -O option.
 
         :param e: the edge to be added.
+        :param v: the extremity of e that is not this node.
         :raises TypeError: if e is not an edge.
-        :raises LinkError: if the node is not an extremity of e.
+        :raises LinkError: if the node and v are not the extremities of e.
         """
-        try:
-            v = e.neighbor(self)
-            if v is not None:
-                self.__edges[v] = e
-            else:
-                if not isinstance(e, Edge):
-                    raise TypeError()
-                else:
-                    raise LinkError(self._graph, e, str(self) + ' is not one of the extremities.')
-        except AttributeError:
-            if not isinstance(e, Edge):
-                raise TypeError()
-            else:
-                raise
+        if __debug__:
+            self.__check_extremities(e, v)
+        self.__edges[v] = e
 
-    def _remove_incident_edge(self, e):
-        """Remove the edge e from the list of incident edges of this node (and the corresponding neighbor from the list
-        of neighbors).
+    def _remove_incident_edge(self, e, v):
+        """Remove the edge e from the list of incident edges of this node (and the neighbor v from the list of
+        neighbors).
 
-        Remove the edge e from the list of incident edges of this node (and the corresponding neighbor from the list
-        of neighbors). If the node is not an extremity of e, an exception is raised.
+        Remove the edge e from the list of incident edges of this node (and the neighbor v from the list of
+        neighbors). The node v should be the other extremity of e, as given by the graph. If the node is not an
+        extremity of e or if e is not an edge, an exception is raised, unless Python runs with the -O option.
 
         :param e: the edge to be removed.
+        :param v: the extremity of e that is not this node.
         :raises TypeError: if e is not an edge.
-        :raises LinkError: if the node is not an extremity of e.
+        :raises LinkError: if the node and v are not the extremities of e.
         """
-        try:
-            v = e.neighbor(self)
-            if v is not None:
-                self._remove_neighbor(v)
-            else:
-                if not isinstance(e, Edge):
-                    raise TypeError()
-                else:
-                    raise LinkError(self._graph, e, str(self) + ' is not one of the extremities.')
-        except AttributeError:
-            if not isinstance(e, Edge):
-                raise TypeError()
-            else:
-                raise
+        if __debug__:
+            self.__check_extremities(e, v)
+        self._remove_neighbor(v)
+
+    def __check_extremities(self, e, v):
+        """Raise an exception if e is not an edge linking this node and the node v."""
+        if not isinstance(e, Edge):
+            raise TypeError()
+        if not (e._u is self and e._v is v or e._u is v and e._v is self):
+            raise LinkError(self._graph, e, str(self) + ' is not one of the extremities.')
 
 
 class Edge(_Link):
@@ -252,6 +259,8 @@ class Edge(_Link):
     this case, it always returns False.
     """
 
+    __slots__ = ()
+
     @property
     def extremities(self):
         """Return the two extremities of the edge."""
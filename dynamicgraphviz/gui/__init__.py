@@ -1,8 +1,8 @@
 """Provide some useful modules to display graphs and animations.
 
 Provide some useful modules to display graphs and animations. This package contains the module `graphDrawer` used to
-display undirected and directed graphs. It also contains the package `animations` designed to animate the drawing with
-easing functions.
+display undirected and directed graphs, and the module `geometry` computing the parts of the drawing to update after a
+change. It also contains the package `animations` designed to animate the drawing with easing functions.
 """
 
 __author__ = "Dimitri Watel"
@@ -1,7 +1,8 @@
 """This package contains all the modules used to animate objects.
 
-This package contains all the modules used to animate objects. It currently contains only one module,
-`easing_animations`, that animate objects using the easing functions techniques.
+This package contains all the modules used to animate objects. It currently contains the module `easing_animations`,
+that animate objects using the easing functions techniques, and the module `easing`, that provides the easing functions
+and computes the frames of the animations without depending on Gtk.
 """
 __author__ = "Dimitri Watel"
 __copyright__ = "Copyright 2018, dynamicgraphviz"
@@ -0,0 +1,146 @@
+"""Provide the easing functions and the computation of the frames of an animation.
+
+This module provides multiple classic easing functions, each normalized from 0 to 1, and the class computing the
+intermediate vectors of an animation frame by frame. It does not depend on Gtk: the frames are played by the timer of
+the module `easing_animations`, which also exports the easing functions.
+"""
+
+
+from functools import lru_cache
+from math import cos, pi, sin
+
+__author__ = "Dimitri Watel"
+__copyright__ = "Copyright 2018, dynamicgraphviz"
+
+_FPS = 24
+
+_FRAME_MS = 1000 // _FPS
+"""Number of milliseconds between two frames, as an integer as expected by `GObject.timeout_add`."""
+
+
+def _number_frames(duration):
+    """Return the number of frames of an animation lasting the given duration in milliseconds.
+
+    The frames are played every `_FRAME_MS` milliseconds, which is a truncation of 1000 / `_FPS`. The number of frames
+    is computed from that actual period rather than from `_FPS`, so that the animation lasts the given duration, give or
+    take half a period, whatever its length. An animation lasts at least one frame, so that it always ends with the
+    ending vector."""
+    return max(1, round(duration / _FRAME_MS))
+
+
+@lru_cache(maxsize=64)
+def _scales(easing_function, number_frames):
+    """Return the values of the easing function at each of the number_frames + 1 frames of an animation.
+
+    The values only depend on the function and on the number of frames, they are computed once and shared by all the
+    animations with the same duration. Only the values of the 64 most recently used couples are kept."""
+    return tuple(easing_function(frame / number_frames) for frame in range(number_frames + 1))
+
+
+class _EasingAnimation:
+    """Animation an object using the specified easing function.
+
+    This class allows to animate an object from one value to another. The object should be a member of a vector space
+    implementing the addition and the subtraction of vectors and the multiplication to a real scalar. If u and v are two
+    such vectors, it should satisfy u = u + (v - u) * 0 and v = u + (v - u) * 1. For any l from 0 to 1, u + (v - u) * l
+    should represent an 'intermediate' vector so that the animation smoothly transforms u into v while smoothly moving l
+    from 0 to 1.
+
+    This class should not be manually instantiated. Use the `easing_animations.animate_with_easing` function instead.
+
+    It is possible to specify the easing_function, the duration of the animation in number of frames and the callback
+    to act with the animated vector.
+    """
+
+    def __init__(self, begin, end, easing_function, number_frames, callback):
+        self.begin = begin
+        """Origin vector of the animation."""
+
+        self.end = end
+        """Ending vector of the animation."""
+
+        self.delta = end - begin
+        """Difference between the ending vector and the origin vector of the animation."""
+
+        self.easing_function = easing_function
+        self.number_frames = int(number_frames)
+        self.current_frame = 0
+        self.callback = callback
+
+        self.scales = _scales(easing_function, self.number_frames)
+        """Value of the easing function at each frame of the animation."""
+
+    def animate(self):
+        """Build the current value of the animated vector, call the callback with it and return False if this vector is
+        the ending vector and True otherwise."""
+        frame = self.current_frame
+        self.current_frame += 1
+
+        # Call the callback with the current value of the animated vector. The last frame gives the ending vector
+        # itself, as begin + (end - begin) may differ from end because of rounding errors.
+        if frame < self.number_frames:
+            self.callback(self.begin + self.delta * self.scales[frame])
+            return True
+        self.callback(self.end)
+        return False
+
+
+def linear(x):
+    """Return the value at x of the 'linear' easing function between 0 and 1."""
+    return x
+
+
+def quadin(x):
+    """Return the value at x of the 'quadratic in' easing function between 0 and 1."""
+    return x*x
+
+
+def quadout(x):
+    """Return the value at x of the 'quadratic out' easing function between 0 and 1."""
+    return -x*(x-2)
+
+
+def quadinout(x):
+    """Return the value at x of the 'quadratic in out' easing function between 0 and 1."""
+    if x < 0.5:
+        return 2*x*x
+    else:
+        return 1/2 - x*(2*x-2)
+
+
+def cubicin(x):
+    """Return the value at x of the 'cubic in' easing function between 0 and 1."""
+    return x*x*x
+
+
+def cubicout(x):
+    """Return the value at x of the 'cubic out' easing function between 0 and 1."""
+    y = x - 1
+    return y*y*y + 1
+
+
+def cubicinout(x):
+    """Return the value at x of the 'cubic in out' easing function between 0 and 1."""
+    if x < 0.5:
+        return 4 * x*x*x
+    else:
+        y = 2*x - 2
+        return 1/2 * (y*y*y + 2)
+
+
+_HALF_PI = pi / 2
+
+
+def sinin(x):
+    """Return the value at x of the 'sinusoid in' easing function between 0 and 1."""
+    return 1 - cos(x * _HALF_PI)
+
+
+def sinout(x):
+    """Return the value at x of the 'sinusoid out' easing function between 0 and 1."""
+    return sin(x * _HALF_PI)
+
+
+def sininout(x):
+    """Return the value at x of the 'sinusoid in out' easing function between 0 and 1."""
+    return 1/2 * (1 - cos(x * pi))
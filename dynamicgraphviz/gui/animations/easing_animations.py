@@ -2,83 +2,61 @@
 
 This module provides the function `animate` that animates an object with an easing function and the function
 `get_nb_animating` to get the number of current animated objects. Finally, it provides multiple classic easing
-functions. Each function is normalized from 0 to 1.
+functions, defined in the module `easing`. Each function is normalized from 0 to 1.
 """
 
 
-from math import cos, pi, sin
 import gi
 gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk, GObject
+from dynamicgraphviz.gui.animations.easing import _EasingAnimation, _FRAME_MS, _number_frames, linear, quadin, \
+    quadout, quadinout, cubicin, cubicout, cubicinout, sinin, sinout, sininout
 
 __author__ = "Dimitri Watel"
 __copyright__ = "Copyright 2018, dynamicgraphviz"
 
-_animating = 0
-"""The number of current playing animations."""
+_animations = []
+"""The current playing animations."""
 
+_timer = None
+"""Identifier of the timer computing the frames of the playing animations, or None if no animation is playing."""
 
-class __EasingAnimation:
-    """Animation an object using the specified easing function.
 
-    This class allows to animate an object from one value to another. The object should be a member of a vector space
-    implementing the addition of vectors and the multiplication to a real scalar. If u and v are two such vectors, it
-    should satisfy u = u * 1 + v * 0 and v = u * 0 + v * 1. For any l from 0 to 1, u * l + v * (1 - l) should represent
-    an 'intermediate' vector so that the animation smoothly transforms u into v while smoothly moving l from 0 to 1.
+def _tick():
+    """Compute the next frame of every playing animation and return True if an animation is still playing.
 
-    This class should not be manually instantiated. Use the `easing_function.animate` function instead.
-
-    It is possible to specify the easing_function, the duration of the animation in number of frames and the callback
-    to act with the animated vector.
+    This function is called by a single timer for all the animations, so that the Gtk main loop wakes up once per
+    frame whatever the number of playing animations. When the last animation ends, the timer is stopped and the Gtk
+    inner loop is ended.
     """
-
-    def __init__(self, begin, end, easing_function, number_frames, callback):
-        self.begin = begin
-        """Origin vector of the animation."""
-
-        self.end = end
-        """Ending vector of the animation."""
-
-        self.easing_function = easing_function
-        self.number_frames = number_frames
-        self.current_frame = 0
-        self.callback = callback
-
-    def animate(self):
-        """Build the current value of the animated vector, call the callback with it and return True if this vector is
-        the ending vector and False otherwise."""
-        global _animating
-
-        scale = self.easing_function(self.current_frame / self.number_frames)
-        self.current_frame += 1
-
-        # Call the callback with the current value of the animated vector
-        self.callback(self.begin * (1 - scale) + self.end * scale)
-
-        # Stop the animation when all the frames where calculated (scale = 1)
-        if self.current_frame > self.number_frames:
-            _animating -= 1  # GObject.timeout_add do not need locking, every thing is done in the Gtk main loop.
-            if _animating == 0:
-                Gtk.main_quit()  # End one of the Gtk inner loops
-            return False  # Animation finished
-
-        return True  # Animation not finished
-
-
-_FPS = 24
+    global _timer
+    # GObject.timeout_add do not need locking, every thing is done in the Gtk main loop.
+    _animations[:] = [animation for animation in _animations if animation.animate()]
+    if _animations:
+        return True
+    _timer = None
+    Gtk.main_quit()  # End one of the Gtk inner loops
+    return False
 
 
 def animate_with_easing(begin, end, easing_function, duration, callback):
     """Animate an object using the specified easing function during the given duration.
 
     Animate an object from one value to another. The object should be a member of a vector space
-    implementing the addition of vectors and the multiplication to a real scalar. If u and v are two such vectors, it
-    should satisfy u = u * 1 + v * 0 and v = u * 0 + v * 1. For any l from 0 to 1, u * l + v * (1 - l) should represent
-    an 'intermediate' vector so that the animation smoothly transforms u into v while smoothly moving l from 0 to 1.
+    implementing the addition and the subtraction of vectors and the multiplication to a real scalar. If u and v are two
+    such vectors, it should satisfy u = u + (v - u) * 0 and v = u + (v - u) * 1. For any l from 0 to 1, u + (v - u) * l
+    should represent an 'intermediate' vector so that the animation smoothly transforms u into v while smoothly moving l
+    from 0 to 1.
+
+    The animation is computed about 24 times per seconds, every 41 milliseconds, using the `GObject.timeout_add` function, with one timer shared by
+    all the playing animations. At each tick, the current value of the animated vector is computed and a callback is
+    called with that value. That callback should act with that value to 'do' the animation (updating a drawn vector,
+    print a value, ...)
 
-    The animation is computed 24 times per seconds using the `GObject.timeout_add` function. At each tick, the current
-    value of the animated vector is computed and a callback is called with that value. That callback should act with
-    that value to 'do' the animation (updating a drawn vector, print a value, ...)
+    The difference `end - begin` is computed once, when this function is called, and each intermediate vector is
+    `begin + (end - begin) * l`. Thus `end - begin` should be defined, and adding that difference multiplied by a real
+    scalar to begin should give an object of the same kind as begin. For instance, with the euclid3 module,
+    Point2 - Point2 is a Vector2 and Point2 + Vector2 is a Point2. The last intermediate vector is end itself.
 
     :param begin: the origin object of the animation.
     :param end: the ending object of the animation.
@@ -86,69 +64,15 @@ def animate_with_easing(begin, end, easing_function, duration, callback):
     determines the speed of animation from begin to end.
     :param duration: The duration of the animation in milliseconds.
     :param callback: The callback function that will be called with each intermediate vector of the animation.
+    :raises TypeError: if `end - begin` is not defined.
     """
-    global _animating
-    animation = __EasingAnimation(begin, end, easing_function, duration / 1000 * _FPS, callback)
-    _animating += 1
-    GObject.timeout_add(1000 / _FPS, animation.animate)
+    global _timer
+    animation = _EasingAnimation(begin, end, easing_function, _number_frames(duration), callback)
+    _animations.append(animation)
+    if _timer is None:
+        _timer = GObject.timeout_add(_FRAME_MS, _tick)
 
 
 def get_nb_animating_with_easing():
     """Return the number of currently animated vectors."""
-    return _animating
-
-
-def linear(x):
-    """Return the value at x of the 'linear' easing function between 0 and 1."""
-    return x
-
-
-def quadin(x):
-    """Return the value at x of the 'quadratic in' easing function between 0 and 1."""
-    return x**2
-
-
-def quadout(x):
-    """Return the value at x of the 'quadratic out' easing function between 0 and 1."""
-    return -x*(x-2)
-
-
-def quadinout(x):
-    """Return the value at x of the 'quadratic in out' easing function between 0 and 1."""
-    if x < 0.5:
-        return 2*x**2
-    else:
-        return 1/2 - x*(2*x-2)
-
-
-def cubicin(x):
-    """Return the value at x of the 'cubic in' easing function between 0 and 1."""
-    return x**3
-
-
-def cubicout(x):
-    """Return the value at x of the 'cubic out' easing function between 0 and 1."""
-    return (x-1)**3 + 1
-
-
-def cubicinout(x):
-    """Return the value at x of the 'cubic in out' easing function between 0 and 1."""
-    if x < 0.5:
-        return 4 * x**3
-    else:
-        return 1/2 * ((2*x - 2)**3 + 2)
-
-
-def sinin(x):
-    """Return the value at x of the 'sinusoid in' easing function between 0 and 1."""
-    return 1 - cos(x * pi / 2)
-
-
-def sinout(x):
-    """Return the value at x of the 'sinusoid out' easing function between 0 and 1."""
-    return sin(x * pi / 2)
-
-
-def sininout(x):
-    """Return the value at x of the 'sinusoid in out' easing function between 0 and 1."""
-    return 1/2 * (1 - cos(x * pi))
+    return len(_animations)
@@ -0,0 +1,155 @@
+"""Provide the computation of the rectangles covered by the drawings of the nodes, edges, arcs and labels.
+
+This module is used by the module `graphDrawer` to compute the parts of the drawing area to update after a change. Its
+functions only work with floats and tuples and do not depend on Gtk nor on cairo. A rectangle is a tuple (x, y, w, h)
+of the coordinates of its top left corner, its width and its height. The module also provides the class `Damage`
+accumulating the parts to update until the next redraw.
+"""
+
+import math
+
+__author__ = "Dimitri Watel"
+__copyright__ = "Copyright 2018, dynamicgraphviz"
+
+
+_ARROW_COS = math.cos(math.pi / 4)
+"""Cosine of the angle between an arc and each side of its arrow."""
+_ARROW_SIN = math.sin(math.pi / 4)
+"""Sine of the angle between an arc and each side of its arrow."""
+
+
+def intersect(rect1, rect2):
+    """ Return True if the two rectangles rect1 and rect2 intersect. """
+    x1, y1, w1, h1 = rect1
+    x2, y2, w2, h2 = rect2
+    return (x1 + w1 > x2 and x2 + w2 > x1) and (y1 + h1 > y2 and y2 + h2 > y1)
+
+
+def union(rect1, rect2):
+    """ Return the smallest rectangle containing the two rectangles rect1 and rect2. """
+    x1, y1, w1, h1 = rect1
+    x2, y2, w2, h2 = rect2
+    x = min(x1, x2)
+    y = min(y1, y2)
+    return x, y, max(x1 + w1, x2 + w2) - x, max(y1 + h1, y2 + h2) - y
+
+
+def union_all(rects):
+    """Return the smallest rectangle containing all the rectangles rects, or None if one of them is None, that is if
+    one of the drawings is not known and the whole drawing area should be updated."""
+    result = None
+    for rect in rects:
+        if rect is None:
+            return None
+        result = rect if result is None else union(result, rect)
+    return result
+
+
+def node_bounds(x, y, radius, line_width):
+    """Return a rectangle containing the circle of a node centered on (x, y) with the given radius, stroked with the
+    given line width."""
+    r = radius + line_width / 2 + 1
+    return x - r, y - r, 2 * r, 2 * r
+
+
+def link_points(ux, uy, vx, vy, du, dv, arrow_length=None):
+    """Return the coordinates (x0, y0, x1, y1) of the extremities of the line of an edge or an arc from (ux, uy) to
+    (vx, vy), followed by the coordinates of the two other ends of its arrow if arrow_length is not None.
+
+    The line starts at a distance du from (ux, uy) and ends at a distance dv from (vx, vy), so that it only joins the
+    borders of the circles of its extremities."""
+    dx = vx - ux
+    dy = vy - uy
+    norm = math.hypot(dx, dy)
+    if norm:
+        dx /= norm
+        dy /= norm
+
+    x1 = vx - dx * dv
+    y1 = vy - dy * dv
+    points = (ux + dx * du, uy + dy * du, x1, y1)
+
+    if arrow_length is not None:
+        # Rotations of the direction of the arc by pi / 4 and -pi / 4
+        points += (x1 - (dx * _ARROW_COS - dy * _ARROW_SIN) * arrow_length,
+                   y1 - (dx * _ARROW_SIN + dy * _ARROW_COS) * arrow_length,
+                   x1 - (dx * _ARROW_COS + dy * _ARROW_SIN) * arrow_length,
+                   y1 - (-dx * _ARROW_SIN + dy * _ARROW_COS) * arrow_length)
+    return points
+
+
+def link_bounds(ux, uy, vx, vy, line_width, arrow_length=None):
+    """Return a rectangle containing the line of an edge or an arc from (ux, uy) to (vx, vy), stroked with the given
+    line width, and its arrow if arrow_length is not None.
+
+    The rectangle contains the segment between the two extremities, so it contains the line computed by `link_points`
+    as long as the circles of the extremities do not overlap."""
+    margin = line_width / 2 + 1
+    if arrow_length is not None:
+        margin += arrow_length
+    return (min(ux, vx) - margin, min(uy, vy) - margin,
+            abs(vx - ux) + 2 * margin, abs(vy - uy) + 2 * margin)
+
+
+def label_position(ux, uy, vx, vy, distance):
+    """Return the coordinates (x, y) of the center of the label of an edge or an arc from (ux, uy) to (vx, vy), at the
+    given distance of the middle of the link, above it or on its right if it is vertical."""
+    dx = vx - ux
+    dy = vy - uy
+    norm = math.hypot(dx, dy)
+    if norm:
+        dx /= norm
+        dy /= norm
+
+    # Normal vector of the link pointing up, or to the right if the link is vertical
+    if dx > 0 or dx == 0 and dy > 0:
+        nx, ny = dy, -dx
+    else:
+        nx, ny = -dy, dx
+
+    return (ux + vx) / 2 + nx * distance, (uy + vy) / 2 + ny * distance
+
+
+def label_bounds(x, y, width, height):
+    """Return a rectangle containing a label of the given width and height centered on (x, y)."""
+    return x - width / 2 - 1, y - height / 2 - 1, width + 2, height + 2
+
+
+def pixel_bounds(rect):
+    """Return a rectangle of integer coordinates and sizes containing the rectangle rect, that is containing every
+    pixel rect overlaps."""
+    x, y, w, h = rect
+    return math.floor(x), math.floor(y), math.ceil(w) + 1, math.ceil(h) + 1
+
+
+class Damage:
+    """Parts of a drawing area to update at the next redraw.
+
+    The parts are accumulated as rectangles until they are taken by the redraw. Adding None instead of a rectangle
+    means that the whole area should be updated; the rectangles are then dropped until the parts are taken.
+    """
+
+    __slots__ = ('rects',)
+
+    def __init__(self):
+        """Create an empty set of parts to update."""
+        self.rects = []
+        """Rectangles to update, or None to update the whole area."""
+
+    def __bool__(self):
+        """Return True if a part of the area should be updated."""
+        return self.rects is None or bool(self.rects)
+
+    def add(self, rect):
+        """Add the rectangle rect, or the whole area if rect is None, to the parts to update."""
+        if rect is None:
+            self.rects = None
+        elif self.rects is not None:
+            self.rects.append(rect)
+
+    def take(self):
+        """Return the parts to update as a list of rectangles of integer coordinates (see `pixel_bounds`), or None if
+        the whole area should be updated, and empty the set of parts to update."""
+        rects = self.rects
+        self.rects = []
+        return None if rects is None else [pixel_bounds(rect) for rect in rects]
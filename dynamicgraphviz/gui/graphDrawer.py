@@ -21,17 +21,18 @@ on the window.
 
 import gi
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, Gdk
+from gi.repository import Gtk, Gdk, GLib
 import math
 import cairo
-from pubsub import pub
-from euclid3 import Point2, Vector2
+from euclid3 import Point2
 from dynamicgraphviz.gui.animations.easing_animations import get_nb_animating_with_easing, animate_with_easing, sininout
-from copy import copy
+from dynamicgraphviz.gui.geometry import Damage, intersect, union, union_all, node_bounds, link_points, link_bounds, \
+    label_position, label_bounds
 from dynamicgraphviz.exceptions.graph_errors import *
 from dynamicgraphviz.graph.undirectedgraph import UndirectedNode, Edge
 from dynamicgraphviz.graph.directedgraph import DirectedNode, Arc
 import random
+from contextlib import contextmanager
 
 __author__ = "Dimitri Watel"
 __copyright__ = "Copyright 2018, dynamicgraphviz"
@@ -73,6 +74,12 @@ LINK_LABEL_FONT = ("Courier", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
 LINK_LABEL_FONT_SIZE = 20
 """Default font size of the label of an edge/arc."""
 
+BARNES_HUT_MIN_NODES = 200
+"""Minimum number of nodes from which the repulsions of the force directed layout are approximated."""
+BARNES_HUT_THETA = 0.9
+"""Opening criterion of the approximation of the repulsions: a group of nodes whose size divided by its distance to a
+node is less than that value repulses that node as a single node."""
+
 
 class GraphDrawer(Gtk.Window):
     """A Gtk window used to draw a graph.
@@ -85,16 +92,15 @@ class GraphDrawer(Gtk.Window):
     The automatic updates are the following:
     - when a node, an edge or an arc is added, the drawing area is updated;
     - when a node, an edge or an arc is removed, the drawing area is updated.
-    Those automatic updates are done using the `pubsub` library. The drawer subscribes to the following topic where
-    id_graph is the id of the current drawn graph (computed with the `id` function):
-    - 'id_graph.add_node' with one argument corresponding to the added node, and one keyword argument name `draw` (see
+    Those automatic updates are done with callbacks registered on the drawn graph. The drawer registers the following
+    callbacks:
+    - with `on_add_node`, called with one argument corresponding to the added node, and one argument `draw` (see below)
+    - with `on_add_arc`, called with one argument corresponding to the added edge or arc, and one argument `draw` (see
     below)
-    - 'id_graph.add_arc' with one argument corresponding to the added edge or arc, and one keyword argument name `draw`
-    (see below)
-    - 'id_graph.remove_node' with one argument corresponding to the removed node, and one keyword argument name `draw`
+    - with `on_remove_node`, called with one argument corresponding to the removed node, and one argument `draw` (see
+    below)
+    - with `on_remove_arc`, called with one argument corresponding to the removed edge or arc, and one argument `draw`
     (see below)
-    - 'id_graph.remove_arc' with one argument corresponding to the removed edge or arc, and one keyword argument name
-    `draw` (see below)
 
     The manually updates are done using the following methods:
     - `set_color`: change the external color of a node or the color of an edge or an arc, the default
@@ -147,6 +153,22 @@ class GraphDrawer(Gtk.Window):
         self.__nodeitems = {}
         self.__arcitems = {}
 
+        # Images of the circles of the nodes, drawn once for each style (see `_NodeItem._draw`).
+        self.__node_sprites = {}
+
+        # Off-screen copy of the drawing area, with its size. It is copied to the window when Gtk asks to draw it, and
+        # the graph is only drawn again on the parts of it that changed since (or on all of it if the parts are None).
+        self.__buffer = None
+        self.__buffer_size = None
+        self.__buffer_damage = None
+
+        # Nodes and shortest path distances of the graph used to place the nodes, or None if the graph was edited since
+        # they were computed.
+        self.__distances = None
+
+        self.__damage = Damage()
+        """Parts of the drawing area to update at the next redraw."""
+
         self.__current_x = WIDTH / 2
         self.__current_y = HEIGHT / 2
         self.__current_radius = 0
@@ -165,30 +187,40 @@ class GraphDrawer(Gtk.Window):
         self.set_keep_above(True)
         self.__exited = False
         self.__paused = None
+        self.__redraw_pending = False
+        self.__batching = 0
+        """Number of nested `batch_updates` blocks being executed."""
 
         self.redraw()
 
     def __next_coords(self):
-        """Compute the next place where a node should be drawn when added to the graph."""
-        self.__current_angle += self.__delta_angle
-        if self.__current_angle >= 2 * math.pi:
-            self.__current_angle = 0
-            self.__current_radius += 4 * NODE_RADIUS
-            self.__delta_angle = (2 * math.pi) * 4 * NODE_RADIUS / (2 * math.pi * self.__current_radius)
-
-        self.__current_x, self.__current_y = \
-            WIDTH / 2 + self.__current_radius * math.cos(self.__current_angle), \
-            HEIGHT / 2 + self.__current_radius * math.sin(self.__current_angle)
-
-        if self.__current_y == HEIGHT / 2 and self.__current_x > WIDTH:
-            # reboot, too much nodes.
-            self.__current_x = WIDTH / 2
-            self.__current_y = HEIGHT / 2
-            self.__current_radius = 0
-            self.__current_angle = 2 * math.pi
-            self.__delta_angle = 0
-        elif self.__current_y > HEIGHT or self.__current_y < 0 or self.__current_x > WIDTH or self.__current_x < 0:
-            self.__next_coords()
+        """Compute the next place where a node should be drawn when added to the graph.
+
+        The places are taken on concentric circles around the center of the window. The places outside the window are
+        skipped, in a loop rather than with recursive calls, and the first place is taken again when a circle does
+        not fit in the window any more.
+        """
+        while True:
+            self.__current_angle += self.__delta_angle
+            if self.__current_angle >= 2 * math.pi:
+                self.__current_angle = 0
+                self.__current_radius += 4 * NODE_RADIUS
+                self.__delta_angle = (2 * math.pi) * 4 * NODE_RADIUS / (2 * math.pi * self.__current_radius)
+
+            self.__current_x, self.__current_y = \
+                WIDTH / 2 + self.__current_radius * math.cos(self.__current_angle), \
+                HEIGHT / 2 + self.__current_radius * math.sin(self.__current_angle)
+
+            if self.__current_y == HEIGHT / 2 and self.__current_x > WIDTH:
+                # reboot, too much nodes.
+                self.__current_x = WIDTH / 2
+                self.__current_y = HEIGHT / 2
+                self.__current_radius = 0
+                self.__current_angle = 2 * math.pi
+                self.__delta_angle = 0
+                return
+            if 0 <= self.__current_x <= WIDTH and 0 <= self.__current_y <= HEIGHT:
+                return
 
     def __init_ui(self):
         """Init the graphical interface of the window, add a drawing area, a status bar and set the events."""
@@ -221,58 +253,77 @@ class GraphDrawer(Gtk.Window):
         self.add(vbox)
 
     def __init_pub(self):
-        """Subscribe to the pubsub topics in order to listen to any update of the graph."""
-        pub.subscribe(self.__add_node, str(id(self.__graph)) + '.add_node')
-        pub.subscribe(self.__add_arc, str(id(self.__graph)) + '.add_arc')
-        pub.subscribe(self.__remove_node, str(id(self.__graph)) + '.remove_node')
-        pub.subscribe(self.__remove_arc, str(id(self.__graph)) + '.remove_arc')
+        """Register callbacks on the graph in order to listen to any update of the graph."""
+        self.__graph.on_add_node(self.__add_node)
+        self.__graph.on_add_arc(self.__add_arc)
+        self.__graph.on_remove_node(self.__remove_node)
+        self.__graph.on_remove_arc(self.__remove_arc)
+
+    def __close_pub(self):
+        """Unregister the callbacks registered on the graph by `__init_pub`, so that the graph does not keep the drawer
+        alive nor call it once the window is closed."""
+        for callback in (self.__add_node, self.__add_arc, self.__remove_node, self.__remove_arc):
+            self.__graph.remove_callback(callback)
 
     def __add_node(self, node, draw=False):
-        """Add one node to the drawing and update it if draw is True. Called with a pubsub event when a node was added
-        to the graph."""
+        """Add one node to the drawing and update it if draw is True. Called by the graph when a node was added to the
+        graph."""
+        self.__distances = None
         try:
             item = _NodeItem(self.__current_x, self.__current_y)
             self.__next_coords()
             item.label = str(node.index)
             self.__nodeitems[node] = item
             if draw:
-                self.redraw()
+                self.__redraw_rects(item._bounds())
+            else:
+                self.__add_damage(item._bounds())
         except KeyError:
             pass
 
     def __add_arc(self, arc, draw=False):
-        """Add one edge or arc to the drawing and update it if draw is True. Called with a pubsub event when a link was
+        """Add one edge or arc to the drawing and update it if draw is True. Called by the graph when a link was
         added to the graph."""
+        self.__distances = None
         try:
             u, v = arc.extremities
             nodeitemu = self.__nodeitems[u]
             nodeitemv = self.__nodeitems[v]
-            self.__arcitems[arc] = _ArcItem(nodeitemu, nodeitemv, arc.directed)
+            item = _ArcItem(nodeitemu, nodeitemv, arc.directed)
+            self.__arcitems[arc] = item
 
             if draw:
-                self.redraw()
+                self.__redraw_rects(item._bounds())
+            else:
+                self.__add_damage(item._bounds())
         except KeyError:
             pass
 
     def __remove_node(self, node, draw=False):
-        """Remove one node to the drawing and update it if draw is True. Called with a pubsub event when a node was
+        """Remove one node to the drawing and update it if draw is True. Called by the graph when a node was
         removed from the graph."""
+        self.__distances = None
         try:
-            del self.__nodeitems[node]
+            item = self.__nodeitems.pop(node)
 
             if draw:
-                self.redraw()
+                self.__redraw_rects(item._bounds())
+            else:
+                self.__add_damage(item._bounds())
         except KeyError:
             pass
 
     def __remove_arc(self, arc, draw=False):
-        """Remove one edge or arc to the drawing and update it if draw is True. Called with a pubsub event when a link
+        """Remove one edge or arc to the drawing and update it if draw is True. Called by the graph when a link
         was removed from the graph."""
+        self.__distances = None
         try:
-            del self.__arcitems[arc]
+            item = self.__arcitems.pop(arc)
 
             if draw:
-                self.redraw()
+                self.__redraw_rects(item._bounds())
+            else:
+                self.__add_damage(item._bounds())
         except KeyError:
             pass
 
@@ -288,18 +339,18 @@ class GraphDrawer(Gtk.Window):
         :raises LinkMembershipError: if the edge or arc elem does not belong to the drawn graph.
 
         """
-        try:
-            return self.__nodeitems[elem]
-        except KeyError:
-            try:
-                return self.__arcitems[elem]
-            except KeyError:
-                if isinstance(elem, UndirectedNode) or isinstance(elem, DirectedNode):
-                    raise NodeMembershipError(self.__graph, elem)
-                elif isinstance(elem, Edge) or isinstance(elem, Arc):
-                    raise LinkMembershipError(self.__graph, elem)
-                else:
-                    raise TypeError()
+        # Called by every setter, the lookups do not raise and catch a KeyError when elem is an edge or an arc.
+        item = self.__nodeitems.get(elem)
+        if item is None:
+            item = self.__arcitems.get(elem)
+        if item is not None:
+            return item
+        if isinstance(elem, (UndirectedNode, DirectedNode)):
+            raise NodeMembershipError(self.__graph, elem)
+        elif isinstance(elem, (Edge, Arc)):
+            raise LinkMembershipError(self.__graph, elem)
+        else:
+            raise TypeError()
 
     def move_node(self, v, x, y, draw=False, doanimate=False):
         """Move the node to the coordinates (x, y), update the drawing if draw is True and animate the moving if
@@ -325,19 +376,25 @@ class GraphDrawer(Gtk.Window):
         try:
             u = self.__nodeitems[v]
             if doanimate:
-                item = self.__nodeitems[v]
-                end = Point2(x, y)
-                begin = copy(item.p)
+                # The animated value is the ratio of the moving done, a float, so that no point is built at each frame
+                bx = u.x
+                by = u.y
+                dx = x - bx
+                dy = y - by
 
-                def move_aux(p):
-                    self.move_node(v, p.x, p.y, True)
+                def move_aux(ratio):
+                    self.move_node(v, bx + dx * ratio, by + dy * ratio, True)
 
-                animate_with_easing(begin, end, sininout, 1000, move_aux)
+                animate_with_easing(0.0, 1.0, sininout, 1000, move_aux)
             else:
-                u.p.x = x
-                u.p.y = y
+                # Only the area covered by the node and its incident links, before and after the move, is updated
+                old_rect = self.__bounds_of_node(v) if draw else None
+                u.x = x
+                u.y = y
                 if draw:
-                    self.redraw()
+                    self.__redraw_rects(old_rect, self.__bounds_of_node(v))
+                else:
+                    self.__add_damage(None)
         except KeyError:
             if isinstance(v, UndirectedNode) or isinstance(v, DirectedNode):
                 raise NodeMembershipError(self.__graph, v)
@@ -348,6 +405,9 @@ class GraphDrawer(Gtk.Window):
         """Start all the previously ordered animations. This method ends when the last animation end."""
         if get_nb_animating_with_easing() > 0:
             Gtk.main()
+            # The last frames may have been asked or queued but not drawn before the end of the loop
+            if not self.__exited:
+                self.__redraw_now()
 
     def place_nodes(self, doanimate=False):
         """Automatically replace all the nodes using a force directed graph drawing algorithm of Kamada and Kawai.
@@ -399,14 +459,14 @@ class GraphDrawer(Gtk.Window):
         MAXIMUM_ITERATIONS_PER_NODE = 100
         MAXIMUM_RESET = 10
 
-        # Init the shortest path distances
-        dists = {}
-        for v in self.__graph:
-            dists[v] = _breadth_first_search(self.__graph, v)
+        # Init the shortest path distances, they are only computed again if the graph was edited since the last call.
+        if self.__distances is None:
+            self.__distances = _distances(self.__graph)
+        nodes, dists = self.__distances
 
-        # Init the Kamada-Kawai parameters
+        # Init the Kamada-Kawai parameters
         l0 = NODE_RADIUS * 8
-        l = l0 / max(dists[u][v] for u in self.__graph for v in self.__graph if v in dists[u])
+        l = l0 / max(d for row in dists for d in row if d is not None)
         k = 1
 
         def lij(u, v):
@@ -417,85 +477,73 @@ class GraphDrawer(Gtk.Window):
 
         epsilon = 0.1
 
-        # Init the positions
-        positions = {}
-        for u in self.__graph:
-            positions[u] = copy(self.__nodeitems[u].p)
+        # Init the positions. The nodes are identified by their positions in the list nodes, and the coordinates of
+        # the i-th node are stored in the i-th cells of the lists xs and ys.
+        xs = []
+        ys = []
+        for u in nodes:
+            p = self.__nodeitems[u]
+            xs.append(p.x)
+            ys.append(p.y)
 
         def place_component(comp):
-            """ Use the Kamada-Kawai algorithm to place the nodes of a connected component. """
+            """ Use the Kamada-Kawai algorithm to place the nodes of a connected component.
 
-            def energy_derivative_wrt_x(u):
-                """ Derivative of the energy function E with respect to x(u). """
-                posu = positions[u]
+            Return two lists containing the abscissas and the ordinates of the nodes of the component, in the order of
+            comp. """
 
-                def part(v):
-                    posv = positions[v]
-                    sqt = math.sqrt((posu.x - posv.x) ** 2 + (posu.y - posv.y) ** 2)
-                    return kij(u, v) * ((posu.x - posv.x) - lij(u, v) * (posu.x - posv.x) / sqt)
+            cxs = [xs[u] for u in comp]
+            cys = [ys[u] for u in comp]
 
-                return sum(part(v) for v in comp if v != u)
+            # The constants kij and lij of each couple of nodes of the component, the i-th row containing the constants
+            # of the i-th node of comp with the other nodes, in the order of comp. They are computed once as the main
+            # loop needs them at each iteration. As a row skips the node itself, the loops through the other nodes
+            # zip it with the coordinates without that node instead of comparing the indices at each step.
+            kijs = [[kij(u, v) for v in comp if v != u] for u in comp]
+            lijs = [[lij(u, v) for v in comp if v != u] for u in comp]
 
-            def energy_derivative_wrt_y(u):
-                """ Derivative of the energy function E with respect to y(u). """
-                posu = positions[u]
-
-                def part(v):
-                    posv = positions[v]
-                    sqt = math.sqrt((posu.x - posv.x) ** 2 + (posu.y - posv.y) ** 2)
-                    return kij(u, v) * ((posu.y - posv.y) - lij(u, v) * (posu.y - posv.y) / sqt)
-
-                return sum(part(v) for v in comp if v != u)
-
-            def energy_second_derivative_wrt_x2(u):
-                """ Second derivative of the energy function E with respect to x(u). """
-                posu = positions[u]
-
-                def part(v):
-                    posv = positions[v]
-                    sqt = math.sqrt((posu.x - posv.x) ** 2 + (posu.y - posv.y) ** 2)
-                    return kij(u, v) * (1 - lij(u, v) * (1 / sqt - (posu.x - posv.x)**2 * 1 / sqt**3))
-
-                return sum(part(v) for v in comp if v != u)
-
-            def energy_second_derivative_wrt_xy(u):
-                """ Second derivative of the energy function E with respect to x(u) and y(u). """
-                posu = positions[u]
-
-                def part(v):
-                    posv = positions[v]
-                    sqt = math.sqrt((posu.x - posv.x) ** 2 + (posu.y - posv.y) ** 2)
-                    return kij(u, v) * (lij(u, v) * (posu.x - posv.x) * (posu.y - posv.y) * 1 / sqt**3)
-
-                return sum(part(v) for v in comp if v != u)
-
-            def energy_second_derivative_wrt_y2(u):
-                """ Second derivative of the energy function E with respect to y(u). """
-                posu = positions[u]
+            def derivatives(i):
+                """ First and second derivatives of the energy function E with respect to the position (x(u), y(u)) of
+                the i-th node u of the component.
 
-                def part(v):
-                    posv = positions[v]
-                    sqt = math.sqrt((posu.x - posv.x) ** 2 + (posu.y - posv.y) ** 2)
-                    return kij(u, v) * (1 - lij(u, v) * (1 / sqt - (posu.y - posv.y) ** 2 * 1 / sqt ** 3))
-
-                return sum(part(v) for v in comp if v != u)
-
-            def delta(u):
+                The five derivatives are computed in one loop through the other nodes and returned as a tuple
+                (dE/dx(u), dE/dy(u), d2E/dx(u)2, d2E/dx(u)dy(u), d2E/dy(u)2).
+                """
+                ux = cxs[i]
+                uy = cys[i]
+                dx_sum = dy_sum = dx2_sum = dxy_sum = dy2_sum = 0
+                for vx, vy, k_ij, l_ij in zip(cxs[:i] + cxs[i + 1:], cys[:i] + cys[i + 1:], kijs[i], lijs[i]):
+                    dx = ux - vx
+                    dy = uy - vy
+                    dx2 = dx * dx
+                    dy2 = dy * dy
+                    # The common factors of the five terms are computed once
+                    inv_sqt = 1 / math.sqrt(dx2 + dy2)
+                    l_inv_sqt = l_ij * inv_sqt
+                    l_inv_sqt3 = l_inv_sqt * inv_sqt * inv_sqt
+                    dx_sum += k_ij * (dx - l_inv_sqt * dx)
+                    dy_sum += k_ij * (dy - l_inv_sqt * dy)
+                    dx2_sum += k_ij * (1 - l_inv_sqt + l_inv_sqt3 * dx2)
+                    dxy_sum += k_ij * l_inv_sqt3 * dx * dy
+                    dy2_sum += k_ij * (1 - l_inv_sqt + l_inv_sqt3 * dy2)
+                return dx_sum, dy_sum, dx2_sum, dxy_sum, dy2_sum
+
+            def delta(derivs):
                 """ Delta variable of the algorithm, norm of the gradient of the energy fonction with respect to
-                 the position (x(u), y(u))"""
-                return math.sqrt((energy_derivative_wrt_x(u)) ** 2 + (energy_derivative_wrt_y(u)) ** 2)
+                 the position (x(u), y(u)), given the derivatives of u"""
+                return math.hypot(derivs[0], derivs[1])
 
-            def solve(u):
+            def solve(derivs):
                 """
                 Solve the two variables system of the algorithm determining in which direction a single node should
-                be moved to decrease the energy of the system, assuming the ot.
+                be moved to decrease the energy of the system, assuming the other nodes are not moving, given the
+                derivatives of that node.
                 """
-                a11 = energy_second_derivative_wrt_x2(u)
-                a21 = a12 = energy_second_derivative_wrt_xy(u)
-                a22 = energy_second_derivative_wrt_y2(u)
-
-                b1 = -1 * energy_derivative_wrt_x(u)
-                b2 = -1 * energy_derivative_wrt_y(u)
+                b1 = -1 * derivs[0]
+                b2 = -1 * derivs[1]
+                a11 = derivs[2]
+                a21 = a12 = derivs[3]
+                a22 = derivs[4]
 
                 det = a11 * a22 - a21 * a12
 
@@ -506,11 +554,39 @@ class GraphDrawer(Gtk.Window):
 
                 return h11 * b1 + h12 * b2, h21 * b1 + h22 * b2
 
+            def update_gradients(m, oldx, oldy):
+                """ Update the gradients of the energy function with respect to the positions of the nodes of the
+                component after the m-th node was moved from the position (oldx, oldy). Only the terms depending on the
+                moved node change, so each gradient is updated in constant time. """
+                mx = cxs[m]
+                my = cys[m]
+                for vx, vy, k_ij, l_ij, gradient in zip(cxs[:m] + cxs[m + 1:], cys[:m] + cys[m + 1:], kijs[m], lijs[m],
+                                                         gradients[:m] + gradients[m + 1:]):
+                    dx = vx - mx
+                    dy = vy - my
+                    sqt = math.hypot(dx, dy)
+                    old_dx = vx - oldx
+                    old_dy = vy - oldy
+                    old_sqt = math.hypot(old_dx, old_dy)
+                    gradient[0] += k_ij * ((dx - l_ij * dx / sqt) - (old_dx - l_ij * old_dx / old_sqt))
+                    gradient[1] += k_ij * ((dy - l_ij * dy / sqt) - (old_dy - l_ij * old_dy / old_sqt))
+
+            def steepest():
+                """ Return the index of a node of the component maximizing the norm of the gradient. The squared norms
+                are compared in a list comprehension rather than with a key function called for each node. """
+                norms = [gx * gx + gy * gy for gx, gy in gradients]
+                return norms.index(max(norms))
+
+            # Gradient of the energy function with respect to the position of each node of the component
+            gradients = [list(derivatives(i)[:2]) for i in range(len(comp))]
+
             # Main loop of the algorithm
             # Choose a node maximizing the gradient of the energy with respect to its position
             # Move it to a position where the energy is minimum (assuming the other nodes are not moving)
             # Start again until the maximum gradient is under an epsilon constant.
-            u, dlt = max(((u, delta(u)) for u in comp), key=lambda x: x[1])
+            i = steepest()
+            derivs = derivatives(i)
+            dlt = delta(derivs)
 
             # Number of times we reset the positions of all nodes to avoid local minimum,
             # If it reaches MAXIMUM_RESET, we stop the calculations.
@@ -527,34 +603,61 @@ class GraphDrawer(Gtk.Window):
                 # we reset the positions of the nodes
                 inner_iteration = 0
 
+                oldx = cxs[i]
+                oldy = cys[i]
+                reset = False
+
                 while dlt > epsilon:
                     inner_iteration += 1
                     if outer_iteration > MAXIMUM_ITERATIONS_PER_NODE * len(self.__graph) \
                             or inner_iteration > MAXIMUM_ITERATIONS_PER_NODE * len(self.__graph):
                         if reset_index > MAXIMUM_RESET:  # Give up
-                            return
+                            return cxs, cys
 
-                        for v in comp:
-                            positions[v].x = random.randint(0, WIDTH)
-                            positions[v].y = random.randint(0, HEIGHT)
+                        # Integer coordinates drawn uniformly in the window, in one call per axis
+                        cxs[:] = random.choices(range(WIDTH + 1), k=len(comp))
+                        cys[:] = random.choices(range(HEIGHT + 1), k=len(comp))
                         outer_iteration = 0
 
                         reset_index += 1
+                        reset = True
                         break
                     else:
-                        dx, dy = solve(u)
-                        posi = positions[u]
-                        posi.x += dx
-                        posi.y += dy
-
-                        dlt = delta(u)
+                        dx, dy = solve(derivs)
+                        cxs[i] += dx
+                        cys[i] += dy
 
-                u, dlt = max(((u, delta(u)) for u in comp), key=lambda x: x[1])
+                        derivs = derivatives(i)
+                        dlt = delta(derivs)
 
-        # Place all the connected components independantly
-        components = _connected_components(self.__graph)
+                if reset:
+                    gradients = [list(derivatives(j)[:2]) for j in range(len(comp))]
+                else:
+                    gradients[i] = list(derivs[:2])
+                    update_gradients(i, oldx, oldy)
+
+                i = steepest()
+                derivs = derivatives(i)
+                dlt = delta(derivs)
+
+            return cxs, cys
+
+        # Place all the connected components independantly. The component of a node is the set of nodes at a finite
+        # distance from it, so the components are read from the distances instead of searching the graph again.
+        components = []
+        visited = [False] * len(nodes)
+        for i, row in enumerate(dists):
+            if not visited[i]:
+                comp = [j for j, d in enumerate(row) if d is not None]
+                for j in comp:
+                    visited[j] = True
+                components.append(tuple(comp))
+
+        # Abscissas and ordinates of the nodes of each component
+        compxs = {}
+        compys = {}
         for comp in components:
-            place_component(comp)
+            compxs[comp], compys[comp] = place_component(comp)
 
         #
         # Place the components : place disjoint rectangles on the image so that each component is in one rectangle
@@ -564,10 +667,10 @@ class GraphDrawer(Gtk.Window):
         components.sort(key=len)
 
         # Ratio between current height over width of each component
-        minsx = {comp: min(positions[u].x for u in comp) for comp in components}
-        maxsx = {comp: max(positions[u].x for u in comp) for comp in components}
-        minsy = {comp: min(positions[u].y for u in comp) for comp in components}
-        maxsy = {comp: max(positions[u].y for u in comp) for comp in components}
+        minsx = {comp: min(compxs[comp]) for comp in components}
+        maxsx = {comp: max(compxs[comp]) for comp in components}
+        minsy = {comp: min(compys[comp]) for comp in components}
+        maxsy = {comp: max(compys[comp]) for comp in components}
         ratios = {comp: max(maxsy[comp] - minsy[comp], 4 * NODE_RADIUS) / max(maxsx[comp] - minsx[comp],
                                                                               4 * NODE_RADIUS) for comp in components}
         # Rectangle of the largest component
@@ -583,6 +686,11 @@ class GraphDrawer(Gtk.Window):
         wmax = rectm1[2]
         hmax = rectm1[3]
 
+        # Rectangles of the placed components, indexed by a grid whose cells have the size of the rectangle of a
+        # component with one node, so that only the nearby rectangles are checked when a component is placed.
+        grid = _RectangleGrid(math.sqrt(area_size_ratio))
+        grid.add(rectm1)
+
         # Place each other component.
         for i, comp in enumerate(reversed(components[:-1])):
             index = len(components) - 2 - i
@@ -606,11 +714,8 @@ class GraphDrawer(Gtk.Window):
                 an intersected rectangle among the rectangles of the already placed components. If no such overlapping
                 occurs, the position is valid. In that case, the score is the maximum between width and height of the
                 drawing."""
-                for comp2 in components[index + 1:]:
-                    r2 = rectangles[comp2]
-
-                    if _intersect((x1, y1, w1, h1), r2):
-                        return None
+                if grid.intersects((x1, y1, w1, h1)):
+                    return None
 
                 return max(wmax, x1 + w1, hmax, y1 + h1)
 
@@ -620,6 +725,7 @@ class GraphDrawer(Gtk.Window):
             # Return the valid position minimizing the maximum between the height and the width of the drawing.
             x1, y1 = min((scrs for scrs in scores if scrs[1] is not None), key=lambda x: x[1])[0]
             rectangles[comp] = (x1, y1, w1, h1)
+            grid.add(rectangles[comp])
 
         # Rescale each rectangle so that it fits with the window.
 
@@ -637,6 +743,7 @@ class GraphDrawer(Gtk.Window):
             rectangles[comp] = (x, y, w, h)
 
         # Rescale and move each component in its rectangle.
+        positions = {}
         for comp in components:
             x, y, w, h = rectangles[comp]
 
@@ -645,18 +752,18 @@ class GraphDrawer(Gtk.Window):
             miny = minsy[comp]
             maxy = maxsy[comp]
 
-            for u in comp:
+            for u, ux, uy in zip(comp, compxs[comp], compys[comp]):
                 if maxx != minx:
-                    positions[u].x = x + 2 * NODE_RADIUS + (w - 4 * NODE_RADIUS) * (positions[u].x - minx) / (
-                    maxx - minx)
+                    ux = x + 2 * NODE_RADIUS + (w - 4 * NODE_RADIUS) * (ux - minx) / (maxx - minx)
                 else:
-                    positions[u].x = x + w // 2
+                    ux = x + w // 2
 
                 if maxy != miny:
-                    positions[u].y = y + 2 * NODE_RADIUS + (h - 4 * NODE_RADIUS) * (positions[u].y - miny) / (
-                    maxy - miny)
+                    uy = y + 2 * NODE_RADIUS + (h - 4 * NODE_RADIUS) * (uy - miny) / (maxy - miny)
                 else:
-                    positions[u].y = y + h // 2
+                    uy = y + h // 2
+
+                positions[nodes[u]] = Point2(ux, uy)
 
         return positions
 
@@ -666,65 +773,116 @@ class GraphDrawer(Gtk.Window):
         Automatically replace all the nodes using an algorithm adapted from the force directed graph drawing algorithm
         given at https://cs.brown.edu/~rt/gdhandbook/chapters/force-directed.pdf at page number 387 (5th page of the
         pdf). The temperature starts at 50 and are multiplied by 0.99 at each iteration. The number of iterations is 500
-        times the number of nodes. Those values are purely empirical.
+        times the number of nodes, but the loop stops once the temperature is under 0.01 (the nodes could not move by
+        more than a pixel in all the next iterations) or once no node moves by more than 0.01. Those values are purely
+        empirical.
         A repulsion force from the bounds is added :
         for each node at position (x, y), there are 4 repulsions from (x, 0), (x, HEIGHT), (0, y) and (WIDTH, y),
         this forces the nodes to stay away from the boundaries.
         """
-        forces = {}
-        positions = {}
         temp = 50
-
-        for u in self.__graph.nodes:
-            positions[u] = copy(self.__nodeitems[u].p)
-
-        k = math.sqrt(WIDTH * HEIGHT / len(self.__graph))
-
-        def attraction(mag):
-            return mag ** 2 / k
-
-        def repulsion(mag):
-            return k ** 2 / mag
-
-        for _ in range(500*len(self.__graph)):
-            for u in self.__graph.nodes:
-                force = Vector2(0, 0)
-                posu = positions[u]
-                for v in self.__graph.nodes:
-                    if u == v:
-                        continue
-                    vu = posu - positions[v]
-                    force += vu.normalized() * repulsion(vu.magnitude())
-                forces[u] = force
-
-                bounds = [Vector2(posu.x, 0), Vector2(posu.x, HEIGHT), Vector2(0, posu.y), Vector2(WIDTH, posu.y)]
-
-                for bound in bounds:
-                    boundu = posu - bound
-                    force += boundu.normalized() * repulsion(boundu.magnitude())
-
-            for a in self.__graph.links:
-                u, v = a.extremities
-                uv = positions[v] - positions[u]
-                delta = uv.normalized() * attraction(uv.magnitude())
-                forces[u] += delta
-                forces[v] -= delta
-
-            for u in self.__graph.nodes:
-                posu = positions[u]
-                force = forces[u]
-                disp = min(force.magnitude(), temp)
-                posu += force.normalized() * disp
-
-                posu.x = min(WIDTH - 2 * NODE_RADIUS, max(0, posu.x))
-                posu.y = min(HEIGHT - 2 * NODE_RADIUS, max(0, posu.y))
-
-                force = forces[u]
-                force.x = 0
-                force.y = 0
-
+        min_temp = 0.01
+        min_disp = 0.01
+
+        # The nodes are identified by their positions in the list nodes. The coordinates and the force of the i-th node
+        # are stored in the i-th cells of the lists xs, ys, fxs and fys, so that no vector is built in the main loop.
+        nodes = list(self.__graph.nodes)
+        index = {u: i for i, u in enumerate(nodes)}
+        n = len(nodes)
+        # Positions of the extremities of each edge or arc, computed once for all the iterations
+        links = [(index[u], index[v]) for u, v in (a.extremities for a in self.__graph.links)]
+        xs = []
+        ys = []
+        for u in nodes:
+            p = self.__nodeitems[u]
+            xs.append(p.x)
+            ys.append(p.y)
+
+        k = math.sqrt(WIDTH * HEIGHT / n)
+        k2 = k * k
+        max_x = WIDTH - 2 * NODE_RADIUS
+        max_y = HEIGHT - 2 * NODE_RADIUS
+
+        iterations = min(500 * n, math.ceil(math.log(min_temp / temp) / math.log(0.99)))
+        for _ in range(iterations):
+            # The repulsion between u and v has magnitude k2 / |uv| along uv. On large graphs, the sum of the
+            # repulsions on each node is approximated with a Barnes-Hut tree. Otherwise, the repulsion is computed once
+            # for each couple of nodes.
+            if n >= BARNES_HUT_MIN_NODES:
+                tree = _BarnesHutTree(xs, ys, BARNES_HUT_THETA)
+                forces = [tree.repulsion(i, k2) for i in range(n)]
+                fxs = [fx for fx, _ in forces]
+                fys = [fy for _, fy in forces]
+            else:
+                fxs = [0.0] * n
+                fys = [0.0] * n
+                for i in range(n):
+                    ux = xs[i]
+                    uy = ys[i]
+                    fx = fxs[i]
+                    fy = fys[i]
+                    for j in range(i + 1, n):
+                        dx = ux - xs[j]
+                        dy = uy - ys[j]
+                        f = k2 / (dx * dx + dy * dy)
+                        fx += dx * f
+                        fy += dy * f
+                        fxs[j] -= dx * f
+                        fys[j] -= dy * f
+                    fxs[i] = fx
+                    fys[i] = fy
+
+            # Repulsions from (x, 0), (x, HEIGHT), (0, y) and (WIDTH, y)
+            for i in range(n):
+                ux = xs[i]
+                uy = ys[i]
+                fxs[i] = fxs[i] + k2 / ux + k2 / (ux - WIDTH)
+                fys[i] = fys[i] + k2 / uy + k2 / (uy - HEIGHT)
+
+            # The attraction between u and v, of magnitude |uv|^2 / k along uv
+            for i, j in links:
+                dx = xs[j] - xs[i]
+                dy = ys[j] - ys[i]
+                f = math.hypot(dx, dy) / k
+                fxs[i] += dx * f
+                fys[i] += dy * f
+                fxs[j] -= dx * f
+                fys[j] -= dy * f
+
+            # Each node is moved along its force, by at most the temperature, then kept inside the window. The squared
+            # magnitudes are compared, so that a square root is only computed when the move is shortened.
+            temp2 = temp * temp
+            max_disp2 = 0
+            for i in range(n):
+                fx = fxs[i]
+                fy = fys[i]
+                mag2 = fx * fx + fy * fy
+                if mag2 > temp2:
+                    ratio = temp / math.sqrt(mag2)
+                    x = xs[i] + fx * ratio
+                    y = ys[i] + fy * ratio
+                    max_disp2 = temp2
+                else:
+                    x = xs[i] + fx
+                    y = ys[i] + fy
+                    if mag2 > max_disp2:
+                        max_disp2 = mag2
+
+                if x < 0:
+                    x = 0
+                elif x > max_x:
+                    x = max_x
+                if y < 0:
+                    y = 0
+                elif y > max_y:
+                    y = max_y
+                xs[i] = x
+                ys[i] = y
+
+            if max_disp2 < min_disp * min_disp:
+                break
             temp *= 0.99
-        return positions
+        return {u: Point2(x, y) for u, x, y in zip(nodes, xs, ys)}
 
     def set_color(self, elem, color, draw=False):
         """Change the color of the element elem and update the drawing if draw is true.
@@ -749,9 +907,12 @@ class GraphDrawer(Gtk.Window):
         item = self.__getitem(elem)
         if item is None:
             return
+        old_rect = self.__bounds_of(elem, item) if draw else None
         item.color = color
         if draw:
-            self.redraw()
+            self.__redraw_rects(old_rect, self.__bounds_of(elem, item))
+        else:
+            self.__add_damage(None)
 
     def set_node_color_fill(self, v, color, draw=False):
         """Change the internal color of the node v and update the drawing if draw is true.
@@ -773,9 +934,12 @@ class GraphDrawer(Gtk.Window):
         """
         try:
             u = self.__nodeitems[v]
+            old_rect = self.__bounds_of_node(v) if draw else None
             u.color_fill = color
             if draw:
-                self.redraw()
+                self.__redraw_rects(old_rect, self.__bounds_of_node(v))
+            else:
+                self.__add_damage(None)
         except KeyError:
             if isinstance(v, UndirectedNode) or isinstance(v, DirectedNode):
                 raise NodeMembershipError(self.__graph, v)
@@ -804,9 +968,12 @@ class GraphDrawer(Gtk.Window):
         item = self.__getitem(elem)
         if item is None:
             return
+        old_rect = self.__bounds_of(elem, item) if draw else None
         item.line_width = width
         if draw:
-            self.redraw()
+            self.__redraw_rects(old_rect, self.__bounds_of(elem, item))
+        else:
+            self.__add_damage(None)
 
     def set_node_radius(self, v, radius, draw=False):
         """Change the radius of the node v and update the drawing if draw is true.
@@ -827,9 +994,12 @@ class GraphDrawer(Gtk.Window):
         """
         try:
             u = self.__nodeitems[v]
+            old_rect = self.__bounds_of_node(v) if draw else None
             u.radius = radius
             if draw:
-                self.redraw()
+                self.__redraw_rects(old_rect, self.__bounds_of_node(v))
+            else:
+                self.__add_damage(None)
         except KeyError:
             if isinstance(v, UndirectedNode) or isinstance(v, DirectedNode):
                 raise NodeMembershipError(self.__graph, v)
@@ -858,9 +1028,12 @@ class GraphDrawer(Gtk.Window):
         item = self.__getitem(elem)
         if item is None:
             return
+        old_rect = self.__bounds_of(elem, item) if draw else None
         item.label = text
         if draw:
-            self.redraw()
+            self.__redraw_rects(old_rect, self.__bounds_of(elem, item))
+        else:
+            self.__add_damage(None)
 
     def set_label_color(self, elem, color, draw=False):
         """Change the color of the label of the element elem and update the drawing if draw is true.
@@ -885,9 +1058,12 @@ class GraphDrawer(Gtk.Window):
         item = self.__getitem(elem)
         if item is None:
             return
+        old_rect = self.__bounds_of(elem, item) if draw else None
         item.label_color = color
         if draw:
-            self.redraw()
+            self.__redraw_rects(old_rect, self.__bounds_of(elem, item))
+        else:
+            self.__add_damage(None)
 
     def set_label_font(self, elem, font, draw=False):
         """Change the font of the label of the element elem and update the drawing if draw is true.
@@ -914,9 +1090,12 @@ class GraphDrawer(Gtk.Window):
         item = self.__getitem(elem)
         if item is None:
             return
+        old_rect = self.__bounds_of(elem, item) if draw else None
         item.label_font = font
         if draw:
-            self.redraw()
+            self.__redraw_rects(old_rect, self.__bounds_of(elem, item))
+        else:
+            self.__add_damage(None)
 
     def set_label_font_size(self, elem, size, draw=False):
         """Change the font size of the label of the element elem and update the drawing if draw is true.
@@ -940,48 +1119,194 @@ class GraphDrawer(Gtk.Window):
         item = self.__getitem(elem)
         if item is None:
             return
+        old_rect = self.__bounds_of(elem, item) if draw else None
         item.label_font_size = size
         if draw:
-            self.redraw()
+            self.__redraw_rects(old_rect, self.__bounds_of(elem, item))
+        else:
+            self.__add_damage(None)
 
     def redraw(self):
         """Redraw the drawing area of the window. Use this method to draw all the previously updates (color, line width,
-        move, ...)"""
+        move, ...)
+
+        If the Gtk main loop is running, for instance during an animation or when a node is dragged during a pause, the
+        drawing is updated once the loop is idle. Thus, the calls done in the same iteration of the loop, like the moves
+        of all the animated nodes at one frame, lead to a single update. That update is then drawn by the loop itself,
+        with its next frame, so that a fast drag of a node never waits for the drawing of each of its moves."""
+        self.__request_redraw(None)
+
+    @contextmanager
+    def batch_updates(self):
+        """Return a context manager grouping all the updates of the drawing asked in its block into a single one.
+
+        In a block `with drawer.batch_updates():`, the calls to `redraw` and to the methods with the keyword argument
+        draw set to True do not update the drawing. All those updates are done at once when the block ends. The blocks
+        can be nested, the update is then done at the end of the outermost block. As the animations update the drawing
+        at each frame, they should not be played in such a block.
+        """
+        self.__batching += 1
+        try:
+            yield
+        finally:
+            self.__batching -= 1
+            if self.__batching == 0 and self.__damage:
+                self.__schedule_redraw()
+
+    def __request_redraw(self, rect, immediately=False):
+        """Update the rectangle rect (x, y, w, h) of the drawing area, or the whole area if rect is None.
+
+        The update is immediate if immediately is True or if the Gtk main loop is not running. Otherwise, it is queued
+        once the loop is idle, with the other updates asked in the meantime, and drawn by the loop (see `redraw`). In a
+        `batch_updates` block, the update is delayed to the end of the block, unless immediately is True."""
+        if self.__exited:
+            return
+        self.__add_damage(rect)
+
+        if immediately or self.__batching == 0:
+            self.__schedule_redraw(immediately)
+
+    def __add_damage(self, rect):
+        """Add the rectangle rect (x, y, w, h), or the whole drawing area if rect is None, to the parts of the drawing
+        area to update at the next redraw, without asking for a redraw.
+
+        This is used for the changes done with draw=False, so that they appear at the next redraw even if that redraw
+        only updates a part of the area."""
+        self.__damage.add(rect)
+
+    def __schedule_redraw(self, immediately=False):
+        """Update the parts of the drawing area asked since the last update, immediately if immediately is True or if
+        the Gtk main loop is not running, and otherwise once the loop is idle."""
         if self.__exited:
             return
-        self.__drawingarea.queue_draw()
+        if immediately or Gtk.main_level() == 0:
+            self.__redraw_now()
+        elif not self.__redraw_pending:
+            self.__redraw_pending = True
+            GLib.idle_add(self.__redraw_if_pending)
+
+    def __redraw_if_pending(self):
+        """Queue the parts of the drawing area asked since the last update, if any, to be drawn by the Gtk main loop.
+        Called by that loop when it is idle."""
+        if self.__redraw_pending and not self.__exited:
+            self.__queue_damage()
+        return False
+
+    def __redraw_now(self):
+        """Immediately update the parts of the drawing area asked since the last update."""
+        self.__queue_damage()
         self.__drawingarea.get_properties('window')[0].process_updates(True)
         while Gtk.events_pending() or not self.is_active() and Gtk.main_level() != 0:
             Gtk.main_iteration()
 
+    def __queue_damage(self):
+        """Queue the parts of the drawing area asked since the last update to be drawn by Gtk."""
+        self.__redraw_pending = False
+        damage = self.__damage.take()
+        if damage is None:
+            self.__buffer_damage = None
+            self.__drawingarea.queue_draw()
+        else:
+            for rect in damage:
+                if self.__buffer_damage is not None:
+                    self.__buffer_damage.append(rect)
+                self.__drawingarea.queue_draw_area(*rect)
+
     def __draw_graph(self, widget, cr):
-        """Called when a draw event is sent to the window. Redraw the whole area with the current value of the graph."""
+        """Called when a draw event is sent to the window. Draw the graph again on the parts of the off-screen copy of
+        the drawing area that changed since the last draw event, then copy it to the window.
+
+        The draw events that are not caused by a change of the drawing, when the window is uncovered for instance,
+        thus only copy the image."""
         if self.__graph is None:
             return
 
+        size = (widget.get_allocated_width(), widget.get_allocated_height())
+        if self.__buffer is None or self.__buffer_size != size:
+            self.__buffer = cr.get_target().create_similar(cairo.CONTENT_COLOR, *size)
+            self.__buffer_size = size
+            self.__buffer_damage = None
+
+        damage = self.__buffer_damage
+        if damage is None or damage:
+            bcr = cairo.Context(self.__buffer)
+            if damage is not None:
+                for rect in damage:
+                    bcr.rectangle(*rect)
+                bcr.clip()
+            self.__draw_scene(widget, bcr)
+            self.__buffer_damage = []
+
+        cr.set_source_surface(self.__buffer, 0, 0)
+        cr.paint()
+
+    def __draw_scene(self, widget, cr):
+        """Draw the graph with the cairo context cr, only in its clip area."""
         cr.set_source_rgb(255, 255, 255)
         cr.paint()
 
+        # If only a part of the area is updated, the items that are not drawn in that part are skipped.
+        x1, y1, x2, y2 = cr.clip_extents()
+        clip = (x1, y1, x2 - x1, y2 - y1)
+        partial = x1 > 0 or y1 > 0 or x2 < widget.get_allocated_width() or y2 < widget.get_allocated_height()
+
+        def skipped(item):
+            if not partial:
+                return False
+            rect = item._bounds()
+            return rect is not None and not intersect(rect, clip)
+
+        # The edges and arcs with the same color and line width are stroked at once, then their labels are drawn.
+        # The nodes are still drawn one by one, as a node should hide the nodes drawn before it.
+        groups = {}
+        labeled = []
         for arc in self.__graph.links:
-            self.__draw_arc(arc, cr)
-
-        for node in self.__graph.nodes:
-            self.__draw_node(node, cr)
+            item = self.__arcitems[arc]
+            if skipped(item):
+                continue
+            groups.setdefault((tuple(item.color), item.line_width), []).append(item)
+            if item.label is not None:
+                labeled.append(item)
+
+        for (color, line_width), items in groups.items():
+            cr.set_source_rgb(*color)
+            cr.set_line_width(line_width)
+            for item in items:
+                item._append_path(cr)
+            cr.stroke()
 
-    def __draw_node(self, node, cr):
-        """Draw the given node on the drawing area if that node belongs to the graph."""
-        self.__nodeitems[node]._draw(cr)
+        for item in labeled:
+            item._draw_label(cr)
 
-    def __draw_arc(self, arc, cr):
-        """Draw the given edge or arc on the drawing area if that link belongs to the graph."""
-        self.__arcitems[arc]._draw(cr)
+        for node in self.__graph.nodes:
+            item = self.__nodeitems[node]
+            if not skipped(item):
+                item._draw(cr, self.__node_sprites)
+
+    def __redraw_rects(self, *rects):
+        """Update the part of the drawing area covered by the rectangles rects, or the whole area if one of them is
+        None."""
+        self.__request_redraw(union_all(rects))
+
+    def __bounds_of(self, elem, item):
+        """Return a rectangle (x, y, w, h) containing the drawing of the element elem whose drawing item is item, and
+        the drawings of its incident edges or arcs if it is a node, or None if it is not known."""
+        if isinstance(item, _NodeItem):
+            return self.__bounds_of_node(elem)
+        return item._bounds()
+
+    def __bounds_of_node(self, v):
+        """Return a rectangle (x, y, w, h) containing the drawings of the node v and of its incident edges or arcs, or
+        None if it is not known."""
+        links = v.incident_arcs if self.__graph.directed else v.incident_edges
+        return union_all([self.__nodeitems[v]._bounds()] + [self.__arcitems[link]._bounds() for link in links])
 
     def __is_inside_node(self, v, x, y):
         """Return True if the coordinates (x, y) is inside the node v considering its current position and its
         current radius."""
         try:
             u = self.__nodeitems[v]
-            return (u.p.x - x)**2 + (u.p.y - y)**2 <= u.radius**2
+            return (u.x - x)**2 + (u.y - y)**2 <= u.radius**2
         except KeyError:
             if isinstance(v, UndirectedNode) or isinstance(v, DirectedNode):
                 raise NodeMembershipError(self.__graph, v)
@@ -1004,7 +1329,8 @@ class GraphDrawer(Gtk.Window):
                                              'Press ESC to exit. ' +
                                              'Move the nodes by "dragNdropping" with Shift + Click. ' +
                                              'Click anywhere or press any other key to unpause.')
-            self.redraw()
+            # The drawing is shown during the pause, even in a `batch_updates` block
+            self.__request_redraw(None, immediately=True)
             Gtk.main()
 
     def on_button_press(self, widget, event):
@@ -1021,7 +1347,7 @@ class GraphDrawer(Gtk.Window):
             else:
                 self.__statusbar.pop(self.__paused)
                 self.__paused = None
-                self.redraw()
+                self.__request_redraw(None, immediately=True)
                 Gtk.main_quit()
 
     def on_mouse_move(self, widget, event):
@@ -1051,7 +1377,7 @@ class GraphDrawer(Gtk.Window):
         if self.__paused is not None and Gtk.main_level() != 0:
             self.__statusbar.pop(self.__paused)
             self.__paused = None
-            self.redraw()
+            self.__request_redraw(None, immediately=True)
             Gtk.main_quit()
 
     def __add_statusbar_message(self, context_desc, context_msg):
@@ -1063,6 +1389,7 @@ class GraphDrawer(Gtk.Window):
     def press_on_exit(self, widget, event):
         """Reaction to the event of clicking on the exit button of the window."""
         self.__exited = True
+        self.__close_pub()
         self.destroy()
         for _ in range(Gtk.main_level()):
             Gtk.main_quit()
@@ -1071,9 +1398,13 @@ class GraphDrawer(Gtk.Window):
 class _NodeItem:
     """Item containing all the informations needed to draw a node of the graph."""
 
+    __slots__ = ('x', 'y', 'color', 'color_fill', 'line_width', 'radius', 'label', 'label_color', 'label_font',
+                 'label_font_size', '_label_extents')
+
     def __init__(self, x, y):
         """Create a new node item at position (x,y) with default parameters."""
-        self.p = Point2(x, y)
+        self.x = x
+        self.y = y
 
         self.color = NODE_COLOR
         self.color_fill = NODE_FILL_COLOR
@@ -1083,29 +1414,71 @@ class _NodeItem:
         self.label_color = NODE_LABEL_COLOR
         self.label_font = NODE_LABEL_FONT
         self.label_font_size = NODE_LABEL_FONT_SIZE
-
-    def _draw(self, cr):
-        """Draw the node item using the cairo library on the drawing area of the window."""
-        cr.set_source_rgb(*self.color)
-        cr.set_line_width(self.line_width)
-        cr.arc(self.p.x, self.p.y, self.radius, 0, 2 * math.pi)
-        cr.stroke_preserve()
-        cr.set_source_rgb(*self.color_fill)
-        cr.fill()
+        self._label_extents = None
+        """Label, font and font size of the label the last time it was measured, and the extents (x bearing, y
+        bearing, width, height) measured at that time (see `_measure_label`)."""
+
+    def _bounds(self):
+        """Return a rectangle (x, y, w, h) containing the drawing of the node item, or None if it is not known."""
+        rect = node_bounds(self.x, self.y, self.radius, self.line_width)
+        return _with_label_bounds(self, rect, self.x, self.y)
+
+    def _draw(self, cr, sprites=None):
+        """Draw the node item using the cairo library on the drawing area of the window.
+
+        If sprites is given, the circle is not drawn but copied from an image of the circles with the same style. Such
+        images are drawn once and stored in sprites. The copy is done at the exact position of the node, so that a
+        moving node does not jump from one pixel to the next. The image is then interpolated by cairo when that
+        position is not an integer, and its border, at least one pixel wide, is transparent.
+        """
+        if sprites is None:
+            self.__draw_circle(cr, self.x, self.y)
+        else:
+            target = cr.get_target()
+            key = (tuple(self.color), tuple(self.color_fill), self.line_width, self.radius, target.get_device_scale())
+            half = math.ceil(self.radius + self.line_width / 2) + 1
+            sprite = sprites.get(key)
+            if sprite is None:
+                if len(sprites) >= _NODE_SPRITES_MAX:
+                    sprites.clear()
+                sprite = target.create_similar(cairo.CONTENT_COLOR_ALPHA, 2 * half, 2 * half)
+                self.__draw_circle(cairo.Context(sprite), half, half)
+                sprites[key] = sprite
+            x = self.x - half
+            y = self.y - half
+            cr.set_source_surface(sprite, x, y)
+            cr.rectangle(x, y, 2 * half, 2 * half)
+            cr.fill()
 
         if self.label is not None:
             cr.set_source_rgb(*self.label_color)
             cr.select_font_face(*self.label_font)
             cr.set_font_size(self.label_font_size)
-            (x, y, width, height, dx, dy) = cr.text_extents(self.label)
-            cr.move_to(self.p.x - width / 2 - x, self.p.y - height / 2 - y)
+            (x, y, width, height) = _measure_label(self, cr)
+            cr.move_to(self.x - width / 2 - x, self.y - height / 2 - y)
             cr.show_text(self.label)
             cr.stroke()
 
+    def __draw_circle(self, cr, x, y):
+        """Draw the circle of the node item centered on (x, y) using the cairo library."""
+        cr.set_source_rgb(*self.color)
+        cr.set_line_width(self.line_width)
+        cr.arc(x, y, self.radius, 0, 2 * math.pi)
+        cr.stroke_preserve()
+        cr.set_source_rgb(*self.color_fill)
+        cr.fill()
+
+
+_NODE_SPRITES_MAX = 256
+"""Maximum number of images of node circles kept by a drawer. When it is reached, all the images are dropped."""
+
 
 class _ArcItem:
     """Item containing all the informations needed to draw an adge or an arc of the graph."""
 
+    __slots__ = ('u', 'v', 'directed', 'color', 'line_width', 'label', 'label_color', 'label_font', 'label_font_size',
+                 '_label_extents', '_path')
+
     def __init__(self, u, v, directed):
         """Create a new edge or arc item at position (x,y) with default parameters."""
         self.u = u
@@ -1118,105 +1491,276 @@ class _ArcItem:
         self.label_color = LINK_LABEL_COLOR
         self.label_font = LINK_LABEL_FONT
         self.label_font_size = LINK_LABEL_FONT_SIZE
+        self._label_extents = None
+        """Label, font and font size of the label the last time it was measured, and the extents (x bearing, y
+        bearing, width, height) measured at that time (see `_measure_label`)."""
+        self._path = None
+        """Positions of the extremities and radii of their circles the last time the path of the item was computed,
+        followed by the points of that path (see `_append_path`)."""
+
+    def _bounds(self):
+        """Return a rectangle (x, y, w, h) containing the drawing of the edge or arc item, or None if it is not
+        known."""
+        pu = self.u
+        pv = self.v
+        rect = link_bounds(pu.x, pu.y, pv.x, pv.y, self.line_width, LINK_ARROW_LENGTH if self.directed else None)
+        if self.label is None:
+            return rect
+        return _with_label_bounds(self, rect, *self.__label_position())
 
     def _draw(self, cr):
         """Draw the edge or arc item using the cairo library on the drawing area of the window."""
-        pu = self.u.p
-        pv = self.v.p
         cr.set_source_rgb(*self.color)
         cr.set_line_width(self.line_width)
-        uv = (pv - pu).normalized()
+        self._append_path(cr)
+        cr.stroke()
+        self._draw_label(cr)
 
-        pu1 = pu + uv * (self.u.radius + self.u.line_width / 2)
-        pv1 = pv - uv * (self.v.radius + self.v.line_width / 2)
+    def _append_path(self, cr):
+        """Append the line of the edge or arc item, and its arrow if it is an arc, to the current path of cr.
 
-        cr.move_to(pu1.x, pu1.y)
-        cr.line_to(pv1.x, pv1.y)
-        cr.stroke()
+        The line and the arrow are drawn with the same color and width, so they are appended to the same path and
+        stroked at once. The coordinates are computed with floats rather than with vectors, and only when the
+        extremities moved or their circles changed since the last call.
+        """
+        pu = self.u
+        pv = self.v
+        du = pu.radius + pu.line_width / 2
+        dv = pv.radius + pv.line_width / 2
+        key = (pu.x, pu.y, pv.x, pv.y, du, dv)
+        path = self._path
+        if path is None or path[0] != key:
+            path = (key,) + link_points(pu.x, pu.y, pv.x, pv.y, du, dv, LINK_ARROW_LENGTH if self.directed else None)
+            self._path = path
+
+        (_, x0, y0, x1, y1) = path[:5]
+        cr.move_to(x0, y0)
+        cr.line_to(x1, y1)
 
         if self.directed:
-            cr.set_source_rgb(*self.color)
-            par1 = pv1 - _rotate(uv, math.pi / 4) * LINK_ARROW_LENGTH
-            par2 = pv1 - _rotate(uv, -math.pi / 4) * LINK_ARROW_LENGTH
-
-            cr.move_to(par1.x, par1.y)
-            cr.line_to(pv1.x, pv1.y)
-            cr.line_to(par2.x, par2.y)
-            cr.stroke()
+            (_, _, _, _, _, ax1, ay1, ax2, ay2) = path
+            cr.move_to(ax1, ay1)
+            cr.line_to(x1, y1)
+            cr.line_to(ax2, ay2)
 
+    def _draw_label(self, cr):
+        """Draw the label of the edge or arc item, if any, using the cairo library on the drawing area of the window."""
         if self.label is not None:
-            nuv = _rotate(uv, math.pi / 2)
-            if nuv.y > 0:
-                nuv = nuv * -1
-
-            plabel = pu + ((pv - pu) / 2) + nuv * LINK_LABEL_DISTANCE
+            lx, ly = self.__label_position()
 
             cr.set_source_rgb(*self.label_color)
             cr.select_font_face(*self.label_font)
             cr.set_font_size(self.label_font_size)
-            (x, y, width, height, dx, dy) = cr.text_extents(self.label)
-            cr.move_to(plabel.x - width / 2 - x, plabel.y - height / 2 - y)
+            (x, y, width, height) = _measure_label(self, cr)
+            cr.move_to(lx - width / 2 - x, ly - height / 2 - y)
             cr.show_text(self.label)
             cr.stroke()
 
+    def __label_position(self):
+        """Return the coordinates (x, y) of the center of the label of the edge or arc item."""
+        pu = self.u
+        pv = self.v
+        return label_position(pu.x, pu.y, pv.x, pv.y, LINK_LABEL_DISTANCE)
+
+
+def _with_label_bounds(item, rect, x, y):
+    """Return the union of rect and of a rectangle containing the label of the item centered on (x, y), or None if the
+    size of that label is not known because the label, its font or its font size changed since it was last drawn."""
+    if item.label is None:
+        return rect
+    extents = item._label_extents
+    if extents is None or extents[:3] != (item.label, item.label_font, item.label_font_size):
+        return None
+    width, height = extents[5:]
+    return union(rect, label_bounds(x, y, width, height))
+
+
+def _measure_label(item, cr):
+    """Return the extents (x bearing, y bearing, width, height) of the label of the item, drawn with the current font
+    of cr.
+
+    The extents are stored in the item and only measured again with cairo when the label, its font or its font size
+    changed since the last call."""
+    extents = item._label_extents
+    if extents is None or extents[:3] != (item.label, item.label_font, item.label_font_size):
+        (x, y, width, height, dx, dy) = cr.text_extents(item.label)
+        extents = (item.label, item.label_font, item.label_font_size, x, y, width, height)
+        item._label_extents = extents
+    return extents[3:]
+
+
+class _RectangleGrid:
+    """Set of rectangles indexed by the cells of a grid, to quickly find the rectangles that may intersect another one.
+
+    Each rectangle is a tuple (x, y, w, h) and is registered in every cell of the grid it covers. Only the rectangles
+    registered in the cells covered by a given rectangle have to be checked to know whether that rectangle intersects
+    one of the rectangles of the set.
+    """
 
-def _rotate(v, alpha):
-    """Return a new 2D vector equal to v rotated with the angle alpha."""
-    cs = math.cos(alpha)
-    sn = math.sin(alpha)
-    return Vector2(v.x * cs - v.y * sn, v.x * sn + v.y * cs)
-
-
-def _intersect(rect1, rect2):
-    """ Return True if the two rectangles rect1 and rect2 intersect. """
-    x1, y1, w1, h1 = rect1
-    x2, y2, w2, h2 = rect2
-    return (x1 + w1 > x2 and x2 + w2 > x1) and (y1 + h1 > y2 and y2 + h2 > y1)
-
-
-def _connected_components(g):
-
-    if len(g) == 0:
-        return []
+    def __init__(self, cell_size):
+        """Create an empty set of rectangles indexed by a grid of square cells of size cell_size."""
+        self.__cell_size = cell_size
+        self.__cells = {}
+
+    def __cells_of(self, rect):
+        """Return an iterator through the coordinates of the cells of the grid covered by the rectangle rect."""
+        x, y, w, h = rect
+        size = self.__cell_size
+        for i in range(int(x // size), int((x + w) // size) + 1):
+            for j in range(int(y // size), int((y + h) // size) + 1):
+                yield i, j
+
+    def add(self, rect):
+        """Add the rectangle rect to the set."""
+        for cell in self.__cells_of(rect):
+            self.__cells.setdefault(cell, []).append(rect)
+
+    def intersects(self, rect):
+        """Return True if the rectangle rect intersects a rectangle of the set and False otherwise."""
+        cells = self.__cells
+        for cell in self.__cells_of(rect):
+            for rect2 in cells.get(cell, ()):
+                if intersect(rect, rect2):
+                    return True
+        return False
+
+
+class _BarnesHutTree:
+    """Quadtree of points used to approximate the sum of the repulsions of all the points on one of them.
+
+    Each cell of the tree stores the number of points it contains and their center of mass. The repulsion of the
+    points of a cell that is far enough from a point, that is whose size divided by its distance to that point is less
+    than theta, is approximated by a single repulsion from its center of mass (see
+    https://en.wikipedia.org/wiki/Barnes%E2%80%93Hut_simulation). Computing the repulsions on all the points then takes
+    O(n log n) steps instead of O(n^2).
+
+    The cells are identified by integers, their data is stored in the cells of flat lists.
+    """
 
-    visited = set()
-    comps = []
-    while len(visited) != len(g):
-        for u in g:
-            if u not in visited:
-                break
+    MAXIMUM_DEPTH = 32
+    """Maximum depth of a cell, the points of a cell at that depth are not split anymore (if they are equal, for
+    instance)."""
+
+    def __init__(self, xs, ys, theta):
+        """Build the tree of the points whose coordinates are given by the lists xs and ys, the i-th point being at
+        position (xs[i], ys[i]), with the given opening criterion theta."""
+        self.__xs = xs
+        self.__ys = ys
+        self.__theta2 = theta * theta
+        self.__cxs = []
+        self.__cys = []
+        self.__counts = []
+        self.__lefts = []
+        self.__tops = []
+        self.__sizes = []
+        self.__children = []
+        self.__points = []
+
+        minx = min(xs)
+        miny = min(ys)
+        size = max(max(xs) - minx, max(ys) - miny)
+        self.__build(list(range(len(xs))), minx, miny, size, 0)
+
+    def __build(self, points, x, y, size, depth):
+        """Add a cell of size size whose upper left corner is (x, y) and containing the given points, and its
+        descendants, to the tree. Return the identifier of that cell."""
+        xs = self.__xs
+        ys = self.__ys
+        cell = len(self.__counts)
+        self.__cxs.append(sum(xs[i] for i in points) / len(points))
+        self.__cys.append(sum(ys[i] for i in points) / len(points))
+        self.__counts.append(len(points))
+        self.__lefts.append(x)
+        self.__tops.append(y)
+        self.__sizes.append(size)
+        self.__children.append(None)
+        self.__points.append(points)
+
+        if len(points) > 1 and depth < _BarnesHutTree.MAXIMUM_DEPTH:
+            half = size / 2
+            midx = x + half
+            midy = y + half
+            quadrants = ([], [], [], [])
+            for i in points:
+                quadrants[(xs[i] >= midx) + 2 * (ys[i] >= midy)].append(i)
+            self.__children[cell] = [self.__build(quadrant, x + half * (q % 2), y + half * (q // 2), half, depth + 1)
+                                     for q, quadrant in enumerate(quadrants) if quadrant]
+            self.__points[cell] = None
+        return cell
+
+    def repulsion(self, i, k2):
+        """Return the approximation of the sum of the repulsions k2 / d along the direction from v to u of the points v
+        at distance d from the i-th point u, as a couple (x, y)."""
+        xs = self.__xs
+        ys = self.__ys
+        cxs = self.__cxs
+        cys = self.__cys
+        theta2 = self.__theta2
+        ux = xs[i]
+        uy = ys[i]
+        fx = fy = 0.0
+        stack = [0]
+        while stack:
+            cell = stack.pop()
+            children = self.__children[cell]
+            if children is None:
+                for j in self.__points[cell]:
+                    if j != i:
+                        dx = ux - xs[j]
+                        dy = uy - ys[j]
+                        f = k2 / (dx * dx + dy * dy)
+                        fx += dx * f
+                        fy += dy * f
+                continue
 
-        dists = _breadth_first_search(g, u)
-        comp = [v for v in g if v in dists]
-        visited.update(comp)
-        comps.append(tuple(comp))
-    return comps
+            dx = ux - cxs[cell]
+            dy = uy - cys[cell]
+            d2 = dx * dx + dy * dy
+            size = self.__sizes[cell]
+            # A cell containing u is always opened, so that u does not repulse itself
+            x = self.__lefts[cell]
+            y = self.__tops[cell]
+            inside = x <= ux <= x + size and y <= uy <= y + size
+            if not inside and size * size < theta2 * d2:
+                f = k2 * self.__counts[cell] / d2
+                fx += dx * f
+                fy += dy * f
+            else:
+                stack.extend(children)
+        return fx, fy
 
 
-def _breadth_first_search(g, v):
+def _distances(g):
     """
-    Return, for each node u, the breadth first search distance from v to u in the graph g.
+    Return the breadth first search distances between every two nodes of the graph g.
 
-    For each node u, returns the distance of a shortest path from v to u in an undirected unweighted graph using the
-    breadth first search algorithm.
+    Return a couple (nodes, dists) where nodes is the list of the nodes of g and dists is a list of lists such that
+    dists[i][j] is the distance of a shortest path from nodes[i] to nodes[j] in the graph g, considered as undirected
+    and unweighted, or None if there is no such path. The neighbors of the nodes are converted once into lists of
+    integer positions so that every breadth first search only handles integers.
 
-    :param g: an undirected graph
-    :param v: a node of g
-    :return: a dictionary associating for each node u the distance of a shortest path from v to u in g
+    :param g: a graph
+    :return: the list of the nodes of g and the matrix of the distances between them.
     """
-
-    to_visit = [v]
-    visited = set()
-    dist = {v: 0}
-
-    while len(to_visit) != 0:
-        u = to_visit.pop(0)
-        visited.add(u)
-        for v in u.neighbors:
-            if v in visited:
-                continue
-            if v not in dist or dist[v] > dist[u] + 1:
-                dist[v] = dist[u] + 1
-            to_visit.append(v)
-
-    return dist
+    nodes = list(g)
+    position = {u: i for i, u in enumerate(nodes)}
+    adjacency = [[position[v] for v in u.neighbors] for u in nodes]
+
+    dists = []
+    for source in range(len(nodes)):
+        dist = [None] * len(nodes)
+        dist[source] = 0
+        level = [source]
+        d = 0
+        while level:
+            # Visit the nodes at distance d + 1 from the source, the neighbors of the nodes at distance d
+            d += 1
+            next_level = []
+            for u in level:
+                for v in adjacency[u]:
+                    if dist[v] is None:
+                        dist[v] = d
+                        next_level.append(v)
+            level = next_level
+        dists.append(dist)
+    return nodes, dists
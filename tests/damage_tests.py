@@ -0,0 +1,123 @@
+import unittest
+
+from dynamicgraphviz.graph.directedgraph import DirectedGraph
+from dynamicgraphviz.graph.undirectedgraph import UndirectedGraph
+from dynamicgraphviz.gui.geometry import Damage, pixel_bounds, node_bounds, link_bounds
+
+CONCURRENTTEST = False
+try:
+    from concurrencytest import ConcurrentTestSuite, fork_for_tests
+    CONCURRENTTEST = True
+except ImportError:
+    pass
+
+
+class TestDamage(unittest.TestCase):
+
+    @staticmethod
+    def contains(rect1, rect2):
+        """Return True if the rectangle rect1 contains the rectangle rect2."""
+        x1, y1, w1, h1 = rect1
+        x2, y2, w2, h2 = rect2
+        return x1 <= x2 and y1 <= y2 and x1 + w1 >= x2 + w2 and y1 + h1 >= y2 + h2
+
+    def assertDamaged(self, rects, rect):
+        """Assert that one of the rectangles rects contains the rectangle rect."""
+        self.assertTrue(any(self.contains(rect2, rect) for rect2 in rects), (rects, rect))
+
+    def listen(self, g, positions):
+        """Register callbacks on g computing the damage of the removals of nodes and links, as a drawer does, and
+        return the list of the damages taken by the redraws.
+
+        A removal adds the bounds of the removed element to the damage. The damage is taken when draw is True."""
+        damage = Damage()
+        redraws = []
+
+        def remove_node(node, draw):
+            damage.add(node_bounds(*positions[node], 20, 2))
+            if draw:
+                redraws.append(damage.take())
+
+        def remove_arc(arc, draw):
+            u, v = arc.extremities
+            damage.add(link_bounds(*positions[u], *positions[v], 2, 10 if g.directed else None))
+            if draw:
+                redraws.append(damage.take())
+
+        g.on_remove_node(remove_node)
+        g.on_remove_arc(remove_arc)
+        return redraws
+
+    def test_empty_damage(self):
+        damage = Damage()
+        self.assertFalse(damage)
+        self.assertEqual(damage.take(), [])
+
+    def test_take_returns_the_added_rectangles_and_empties_the_damage(self):
+        damage = Damage()
+        damage.add((0, 0, 10, 10))
+        damage.add((20.5, 30.25, 5.5, 1))
+        self.assertTrue(damage)
+        self.assertEqual(damage.take(), [(0, 0, 11, 11), (20, 30, 7, 2)])
+        self.assertFalse(damage)
+        self.assertEqual(damage.take(), [])
+
+    def test_whole_area(self):
+        damage = Damage()
+        damage.add((0, 0, 10, 10))
+        damage.add(None)
+        damage.add((20, 30, 5, 1))
+        self.assertTrue(damage)
+        self.assertIsNone(damage.take())
+        self.assertFalse(damage)
+        self.assertEqual(damage.take(), [])
+
+    def test_pixel_bounds_contain_the_rectangle(self):
+        for rect in ((0, 0, 10, 10), (0.5, 0.5, 10, 10), (-3.7, 2.2, 0.1, 7.9), (1.9, -1.9, 0, 0)):
+            bounds = pixel_bounds(rect)
+            self.assertTrue(all(isinstance(c, int) for c in bounds))
+            self.assertTrue(self.contains(bounds, rect))
+
+    def test_removing_a_node_damages_the_bounds_of_its_incident_links(self):
+        for g in (UndirectedGraph(), DirectedGraph()):
+            u = g.add_node()
+            v = g.add_node()
+            w = g.add_node()
+            positions = {u: (100, 100), v: (400, 150), w: (50, 700)}
+            if g.directed:
+                g.add_arc(u, v)
+                g.add_arc(w, u)
+            else:
+                g.add_edge(u, v)
+                g.add_edge(w, u)
+
+            redraws = self.listen(g, positions)
+            g.remove_node(u)
+
+            # The links are removed with draw=False, so there is a single redraw, when the node is removed.
+            self.assertEqual(len(redraws), 1)
+            rects = redraws[0]
+            self.assertEqual(len(rects), 3)
+            self.assertDamaged(rects, node_bounds(100, 100, 20, 2))
+            arrow_length = 10 if g.directed else None
+            self.assertDamaged(rects, link_bounds(100, 100, 400, 150, 2, arrow_length))
+            self.assertDamaged(rects, link_bounds(50, 700, 100, 100, 2, arrow_length))
+
+    def test_removing_an_isolated_node_only_damages_its_bounds(self):
+        g = UndirectedGraph()
+        u = g.add_node()
+        g.add_node()
+        redraws = self.listen(g, {u: (100.5, 100.5)})
+        g.remove_node(u)
+        self.assertEqual(redraws, [[pixel_bounds(node_bounds(100.5, 100.5, 20, 2))]])
+
+
+if __name__ == '__main__':
+
+    if CONCURRENTTEST:
+        suite = unittest.TestLoader().loadTestsFromTestCase(TestDamage)
+        runner = unittest.TextTestRunner()
+        concurrent_suite = ConcurrentTestSuite(suite, fork_for_tests(50))
+        runner.run(concurrent_suite)
+    else:
+        unittest.main()
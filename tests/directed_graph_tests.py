@@ -194,6 +194,54 @@ class TestDirectedGraph(unittest.TestCase):
         else:
             self.assertEqual(e, self.currentarc)
 
+    def test_edits_submit_pubsub_msg_to_the_topic_of_the_graph(self):
+        topics = []
+
+        def receive_msg(topic=pub.AUTO_TOPIC, **msg_data):
+            topics.append(topic.getName())
+
+        pub.subscribe(receive_msg, str(id(self.g)))
+        v1 = self.g.add_node()
+        v2 = self.g.add_node()
+        e = self.g.add_arc(v1, v2)
+        self.g.remove_arc(e)
+        self.g.remove_node(v1)
+        self.assertEqual(topics, [str(id(self.g)) + '.' + name
+                                  for name in ['add_node', 'add_node', 'add_arc', 'remove_arc', 'remove_node']])
+
+    def test_edits_call_the_registered_callbacks(self):
+        calls = []
+        self.g.on_add_node(lambda node, draw: calls.append(('add_node', node, draw)))
+        self.g.on_remove_node(lambda node, draw: calls.append(('remove_node', node, draw)))
+        self.g.on_add_arc(lambda arc, draw: calls.append(('add_arc', arc, draw)))
+        self.g.on_remove_arc(lambda arc, draw: calls.append(('remove_arc', arc, draw)))
+        v1 = self.g.add_node()
+        v2 = self.g.add_node()
+        e1 = self.g.add_arc(v1, v2)
+        e2 = self.g.add_arc(v2, v1)
+        self.g.remove_arc(e1)
+        self.g.remove_node(v1)
+        self.assertEqual(calls, [('add_node', v1, True), ('add_node', v2, True), ('add_arc', e1, True),
+                                 ('add_arc', e2, True), ('remove_arc', e1, True), ('remove_arc', e2, False),
+                                 ('remove_node', v1, True)])
+
+    def test_remove_callback_stops_the_calls(self):
+        calls = []
+
+        def callback(arc, draw):
+            calls.append(arc)
+
+        v1 = self.g.add_node()
+        v2 = self.g.add_node()
+        self.g.on_add_arc(callback)
+        self.g.on_remove_arc(callback)
+        e1 = self.g.add_arc(v1, v2)
+        self.g.remove_callback(callback)
+        self.g.add_arc(v2, v1)
+        self.g.remove_arc(e1)
+        self.g.remove_callback(callback)
+        self.assertEqual(calls, [e1])
+
     def receive_msg_add_arc(self, arc, draw):
         self.b = not self.b
         self.assertIsInstance(arc, Arc)
@@ -242,6 +290,37 @@ class TestDirectedGraph(unittest.TestCase):
         with self.assertRaises(LinkError):
             self.g.add_arc(v1, v2)
 
+    def test_add_arcs_add_the_arcs_to_arcs_in_that_order(self):
+        n = 30
+        for _ in range(n):
+            self.g.add_node()
+
+        couples = [(u, v) for u in self.g for v in self.g if u != v]
+        arcs = self.g.add_arcs(couples)
+
+        self.assertEqual(arcs, list(self.g.arcs))
+        self.assertEqual([a.extremities for a in arcs], couples)
+        for u, v in couples:
+            self.assertTrue(u.is_input_neighbor_of(v))
+
+    def test_add_arcs_raise_the_exceptions_of_add_arc(self):
+        v1 = self.g.add_node()
+        v2 = self.g.add_node()
+        v3 = self.g.add_node()
+        g2 = DirectedGraph()
+        w = g2.add_node()
+        with self.assertRaises(GraphError):
+            self.g.add_arcs([(v1, v2), (v3, v3)])
+        with self.assertRaises(TypeError):
+            self.g.add_arcs([(v1, 1)])
+        with self.assertRaises(NodeMembershipError):
+            self.g.add_arcs([(w, v1)])
+        with self.assertRaises(LinkError):
+            self.g.add_arcs([(v2, v3), (v2, v3)])
+        with self.assertRaises(LinkError):
+            self.g.add_arcs([(v1, v2)])
+        self.assertEqual(self.g.nb_arcs, 2)
+
     # REMOVE ARC
 
     def test_remove_arc_decrease_size_of_arcs_by_one(self):
@@ -623,6 +702,56 @@ class TestDirectedGraph(unittest.TestCase):
         with self.assertRaises(NodeMembershipError):
             self.g.remove_node(v5)
 
+    # STR TESTS
+
+    def test_str_is_the_adjacency_matrix(self):
+        self.assertEqual(str(self.g2), '0 1 0 0 1 0 0 0\n'
+                                       '0 0 1 0 0 1 0 0\n'
+                                       '0 0 0 1 0 0 1 0\n'
+                                       '1 0 0 0 0 0 0 1\n'
+                                       '0 0 0 0 0 0 0 0\n'
+                                       '0 0 0 0 0 0 0 0\n'
+                                       '0 0 0 0 0 0 0 0\n'
+                                       '0 0 0 0 0 0 0 0')
+
+    def test_str_is_updated_when_the_graph_is_edited(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        str(self.g2)
+        self.g2.remove_node(v2)
+        self.g2.remove_arc(self.arcs[2])
+        self.g2.add_arc(v8, v1)
+        self.assertEqual(str(self.g2), '0 0 0 1 0 0 0\n'
+                                       '0 0 1 0 0 0 0\n'
+                                       '1 0 0 0 0 0 1\n'
+                                       '0 0 0 0 0 0 0\n'
+                                       '0 0 0 0 0 0 0\n'
+                                       '0 0 0 0 0 0 0\n'
+                                       '1 0 0 0 0 0 0')
+
+    def test_str_is_the_adjacency_matrix_when_a_node_is_added_after_a_removal(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        self.g2.remove_node(v2)
+        self.g2.remove_node(v5)
+        w1 = self.g2.add_node()
+        w2 = self.g2.add_node()
+        w3 = self.g2.add_node()
+        self.g2.add_arc(w1, v1)
+        self.g2.add_arc(v3, w1)
+        self.g2.add_arc(w3, w2)
+        nodes = list(self.g2)
+        expected = '\n'.join(' '.join('1' if v in set(u.output_neighbors) else '0' for v in nodes) for u in nodes)
+        self.assertEqual(str(self.g2), expected)
+
+    def test_common_output_neighbors_matrix(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        self.g2.add_arc(v2, v5)
+        self.g2.add_arc(v3, v5)
+        self.g2.add_arc(v3, v2)
+
+        expected = [[len(set(u.output_neighbors) & set(v.output_neighbors)) for v in self.nodes] for u in self.nodes]
+        self.assertEqual(self.g2.common_output_neighbors_matrix(), expected)
+        self.assertEqual(self.g2.common_output_neighbors_matrix()[1][2], 1)
+
 
 if __name__ == '__main__':
 
@@ -479,6 +479,14 @@ class TestDirectedNode(unittest.TestCase):
         for v in self.nodes:
             self.assertEqual(len(list(v.input_arcs)) + len(list(v.output_arcs)), len(list(v.incident_arcs)))
 
+    def test_incident_arcs_are_updated_after_an_iteration(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        self.assertEqual(list(v5.incident_arcs), [self.arcs[0]])
+        a = self.g.add_arc(v5, v6)
+        self.assertEqual(list(v5.incident_arcs), [a, self.arcs[0]])
+        self.g.remove_arc(self.arcs[0])
+        self.assertEqual(list(v5.incident_arcs), [a])
+
     def test_add_arc_add_incident_arc(self):
 
         for a, couple in zip(self.arcs, self.couples):
@@ -954,6 +962,83 @@ class TestDirectedNode(unittest.TestCase):
         with self.assertRaises(NodeError):
             v1.get_output_arc(v2)
 
+    def test_get_input_arc_or_none(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        e1, e2, e3, e4, e5, e6, e7, e8, e9, e10 = self.arcs
+
+        self.assertIs(v1.get_input_arc_or_none(v4), e8)
+        self.assertIs(v1.get_input_arc_or_none(v2), e9)
+        self.assertIsNone(v1.get_input_arc_or_none(v5))
+        self.assertIsNone(v1.get_input_arc_or_none(v3))
+        self.g.remove_arc(e9)
+        self.assertIsNone(v1.get_input_arc_or_none(v2))
+
+    def test_get_output_arc_or_none(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        e1, e2, e3, e4, e5, e6, e7, e8, e9, e10 = self.arcs
+
+        self.assertIs(v1.get_output_arc_or_none(v5), e1)
+        self.assertIs(v1.get_output_arc_or_none(v2), e5)
+        self.assertIsNone(v1.get_output_arc_or_none(v4))
+        self.assertIsNone(v1.get_output_arc_or_none(v3))
+        self.g.remove_node(v5)
+        self.assertIsNone(v1.get_output_arc_or_none(v5))
+
+    def test_nb_common_input_neighbors(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+
+        self.assertEqual(v1.nb_common_input_neighbors(v3), 2)
+        self.assertEqual(v3.nb_common_input_neighbors(v1), 2)
+        self.assertEqual(v2.nb_common_input_neighbors(v5), 1)
+        self.assertEqual(v1.nb_common_input_neighbors(v1), v1.nb_input_neighbors)
+        self.assertEqual(v5.nb_common_input_neighbors(v6), 0)
+
+        self.g.remove_node(v4)
+        self.assertEqual(v1.nb_common_input_neighbors(v3), 1)
+
+    def test_nb_common_output_neighbors(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        e1, e2, e3, e4, e5, e6, e7, e8, e9, e10 = self.arcs
+
+        self.assertEqual(v2.nb_common_output_neighbors(v4), 2)
+        self.assertEqual(v4.nb_common_output_neighbors(v2), 2)
+        self.assertEqual(v1.nb_common_output_neighbors(v4), 0)
+        self.assertEqual(v2.nb_common_output_neighbors(v2), v2.nb_output_neighbors)
+
+        self.g.remove_arc(e6)
+        self.assertEqual(v2.nb_common_output_neighbors(v4), 1)
+
+    def test_nb_common_neighbors_raise_TypeError_with_not_node(self):
+        v1 = self.nodes[0]
+
+        with self.assertRaises(TypeError):
+            v1.nb_common_input_neighbors(None)
+
+        with self.assertRaises(TypeError):
+            v1.nb_common_output_neighbors(self.arcs[0])
+
+        with self.assertRaises(TypeError):
+            v1.nb_common_output_neighbors(UndirectedGraph().add_node())
+
+    def test_nb_common_neighbors_raise_NodeMembershipError_with_node_of_other_graph(self):
+        v1 = self.nodes[0]
+        v = DirectedGraph().add_node()
+
+        with self.assertRaises(NodeMembershipError):
+            v1.nb_common_input_neighbors(v)
+
+        with self.assertRaises(NodeMembershipError):
+            v1.nb_common_output_neighbors(v)
+
+    def test_is_incident_to_return_False_with_not_arc(self):
+        v1 = self.nodes[0]
+        u = UndirectedGraph().add_node()
+
+        for elem in [None, 1, v1, u]:
+            self.assertFalse(v1.is_input_arc(elem))
+            self.assertFalse(v1.is_output_arc(elem))
+            self.assertFalse(v1.is_incident_to(elem))
+
 
 if __name__ == '__main__':
 
@@ -0,0 +1,75 @@
+import unittest
+
+from euclid3 import Point2
+from dynamicgraphviz.gui.animations.easing import _EasingAnimation, _FRAME_MS, _number_frames, linear, quadin, \
+    quadout, cubicin, cubicout, cubicinout, sinin, sinout, sininout
+
+CONCURRENTTEST = False
+try:
+    from concurrencytest import ConcurrentTestSuite, fork_for_tests
+    CONCURRENTTEST = True
+except ImportError:
+    pass
+
+
+class TestEasing(unittest.TestCase):
+
+    def play(self, begin, end, easing_function, number_frames):
+        """Play all the frames of an animation from begin to end and return the list of the animated vectors."""
+        values = []
+        animation = _EasingAnimation(begin, end, easing_function, number_frames, values.append)
+        while animation.animate():
+            pass
+        return values
+
+    def test_easing_functions_go_from_0_to_1(self):
+        for f in (linear, quadin, quadout, cubicin, cubicout, cubicinout, sinin, sinout, sininout):
+            self.assertAlmostEqual(f(0), 0)
+            self.assertAlmostEqual(f(1), 1)
+
+    def test_animation_plays_one_more_vector_than_frames(self):
+        self.assertEqual(len(self.play(0.0, 1.0, linear, 1)), 2)
+        self.assertEqual(len(self.play(0.0, 1.0, linear, 24)), 25)
+
+    def test_animation_starts_with_begin_and_ends_with_end(self):
+        for begin, end in ((0.0, 1.0), (0.1, 0.7), (-3.3, 1e16), (1.0, 1.0)):
+            for f in (linear, quadin, sininout, cubicout):
+                values = self.play(begin, end, f, 24)
+                self.assertEqual(values[0], begin)
+                self.assertEqual(values[-1], end)
+
+    def test_animation_of_points_starts_with_begin_and_ends_with_end(self):
+        begin = Point2(10.1, 20.3)
+        end = Point2(400.7, -3.9)
+        values = self.play(begin, end, sininout, 24)
+        self.assertEqual((values[0].x, values[0].y), (begin.x, begin.y))
+        self.assertEqual((values[-1].x, values[-1].y), (end.x, end.y))
+        for value in values:
+            self.assertIsInstance(value, Point2)
+
+    def test_animation_intermediate_vectors_follow_the_easing_function(self):
+        values = self.play(0.0, 2.0, quadin, 4)
+        for frame, value in enumerate(values):
+            self.assertAlmostEqual(value, 2.0 * quadin(frame / 4))
+
+    def test_number_of_frames_honours_the_duration(self):
+        for duration in (0, 1, 20, 41, 100, 500, 1000, 10000, 60000):
+            number_frames = _number_frames(duration)
+            self.assertGreaterEqual(number_frames, 1)
+            if duration >= _FRAME_MS:
+                self.assertLessEqual(abs(number_frames * _FRAME_MS - duration), _FRAME_MS / 2)
+
+    def test_animation_needs_the_difference_of_begin_and_end(self):
+        with self.assertRaises(TypeError):
+            _EasingAnimation('begin', 'end', linear, 24, print)
+
+
+if __name__ == '__main__':
+
+    if CONCURRENTTEST:
+        suite = unittest.TestLoader().loadTestsFromTestCase(TestEasing)
+        runner = unittest.TextTestRunner()
+        concurrent_suite = ConcurrentTestSuite(suite, fork_for_tests(50))
+        runner.run(concurrent_suite)
+    else:
+        unittest.main()
@@ -0,0 +1,156 @@
+import math
+import random
+import unittest
+
+from dynamicgraphviz.gui.geometry import intersect, union, union_all, node_bounds, link_points, link_bounds, \
+    label_position, label_bounds
+
+CONCURRENTTEST = False
+try:
+    from concurrencytest import ConcurrentTestSuite, fork_for_tests
+    CONCURRENTTEST = True
+except ImportError:
+    pass
+
+
+class TestGeometry(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(0)
+
+    def assertCovers(self, rect, x, y, margin=0):
+        """Assert that the rectangle rect contains the square of half side margin centered on (x, y)."""
+        rx, ry, rw, rh = rect
+        self.assertLessEqual(rx, x - margin)
+        self.assertLessEqual(ry, y - margin)
+        self.assertGreaterEqual(rx + rw, x + margin)
+        self.assertGreaterEqual(ry + rh, y + margin)
+
+    def assertCoversNode(self, rect, x, y, radius, line_width):
+        """Assert that the rectangle rect contains the circle of a node, stroked with the given line width."""
+        self.assertCovers(rect, x, y, radius + line_width / 2)
+
+    def assertCoversLink(self, rect, ux, uy, vx, vy, du, dv, line_width, arrow_length=None):
+        """Assert that the rectangle rect contains the line of a link and its arrow, stroked with the given line width.
+
+        Each segment is contained in the rectangle if its ends are. The miter join at the end of the arrow goes
+        further than half the line width from that end, by a factor 1 / sin(pi / 4)."""
+        points = link_points(ux, uy, vx, vy, du, dv, arrow_length)
+        margin = line_width / 2
+        if arrow_length is not None:
+            margin /= math.sin(math.pi / 4)
+        for i in range(0, len(points), 2):
+            self.assertCovers(rect, points[i], points[i + 1], margin)
+
+    def assertCoversLabel(self, rect, x, y, width, height):
+        """Assert that the rectangle rect contains a label of the given width and height centered on (x, y)."""
+        self.assertCovers(rect, x - width / 2, y - height / 2)
+        self.assertCovers(rect, x + width / 2, y + height / 2)
+
+    def links(self, number):
+        """Return a list of random links (ux, uy, vx, vy, du, dv, line_width) whose circles do not overlap."""
+        links = []
+        while len(links) < number:
+            ux, uy, vx, vy = (self.random.uniform(-500, 500) for _ in range(4))
+            du, dv = (self.random.uniform(1, 30) for _ in range(2))
+            line_width = self.random.uniform(0.5, 10)
+            if math.hypot(vx - ux, vy - uy) >= du + dv:
+                links.append((ux, uy, vx, vy, du, dv, line_width))
+        links += [(0, 0, 100, 0, 20, 20, 2), (0, 0, 0, -100, 20, 20, 2), (10, 10, 10, 10, 0, 0, 2)]
+        return links
+
+    def test_intersect(self):
+        self.assertTrue(intersect((0, 0, 10, 10), (5, 5, 10, 10)))
+        self.assertTrue(intersect((0, 0, 10, 10), (2, 2, 1, 1)))
+        self.assertFalse(intersect((0, 0, 10, 10), (10, 0, 10, 10)))
+        self.assertFalse(intersect((0, 0, 10, 10), (0, 11, 10, 10)))
+
+    def test_union(self):
+        self.assertEqual(union((0, 0, 10, 10), (5, 5, 10, 10)), (0, 0, 15, 15))
+        self.assertEqual(union((0, 0, 10, 10), (2, 2, 1, 1)), (0, 0, 10, 10))
+        self.assertEqual(union((-5, 3, 1, 1), (0, 0, 1, 1)), (-5, 0, 6, 4))
+
+    def test_union_all(self):
+        self.assertEqual(union_all([(0, 0, 10, 10)]), (0, 0, 10, 10))
+        self.assertEqual(union_all([(0, 0, 10, 10), (5, 5, 10, 10), (-5, 3, 1, 1)]), (-5, 0, 20, 15))
+        self.assertIsNone(union_all([(0, 0, 10, 10), None, (5, 5, 10, 10)]))
+        self.assertIsNone(union_all([None]))
+
+    def test_node_bounds_cover_the_circle(self):
+        for _ in range(100):
+            x, y = self.random.uniform(-500, 500), self.random.uniform(-500, 500)
+            radius, line_width = self.random.uniform(1, 50), self.random.uniform(0.5, 10)
+            self.assertCoversNode(node_bounds(x, y, radius, line_width), x, y, radius, line_width)
+
+    def test_link_points_join_the_circles(self):
+        for ux, uy, vx, vy, du, dv, _ in self.links(100):
+            x0, y0, x1, y1 = link_points(ux, uy, vx, vy, du, dv)
+            if (ux, uy) != (vx, vy):
+                self.assertAlmostEqual(math.hypot(x0 - ux, y0 - uy), du)
+                self.assertAlmostEqual(math.hypot(x1 - vx, y1 - vy), dv)
+
+    def test_arrow_points_are_at_the_arrow_length_of_the_end_of_the_line(self):
+        for ux, uy, vx, vy, du, dv, _ in self.links(100):
+            x0, y0, x1, y1, ax1, ay1, ax2, ay2 = link_points(ux, uy, vx, vy, du, dv, 10)
+            if (ux, uy) != (vx, vy):
+                self.assertAlmostEqual(math.hypot(ax1 - x1, ay1 - y1), 10)
+                self.assertAlmostEqual(math.hypot(ax2 - x1, ay2 - y1), 10)
+
+    def test_edge_bounds_cover_the_line(self):
+        for ux, uy, vx, vy, du, dv, line_width in self.links(100):
+            rect = link_bounds(ux, uy, vx, vy, line_width)
+            self.assertCoversLink(rect, ux, uy, vx, vy, du, dv, line_width)
+
+    def test_arc_bounds_cover_the_line_and_the_arrow(self):
+        for ux, uy, vx, vy, du, dv, line_width in self.links(100):
+            for arrow_length in (5, 10, 50):
+                rect = link_bounds(ux, uy, vx, vy, line_width, arrow_length)
+                self.assertCoversLink(rect, ux, uy, vx, vy, du, dv, line_width, arrow_length)
+
+    def test_label_position(self):
+        self.assertEqual(label_position(0, 0, 100, 0, 20), (50, -20))
+        self.assertEqual(label_position(100, 0, 0, 0, 20), (50, -20))
+        self.assertEqual(label_position(0, 0, 0, 100, 20), (20, 50))
+        self.assertEqual(label_position(0, 100, 0, 0, 20), (20, 50))
+        for ux, uy, vx, vy, _, _, _ in self.links(100):
+            x, y = label_position(ux, uy, vx, vy, 20)
+            if (ux, uy) != (vx, vy):
+                self.assertAlmostEqual(math.hypot(x - (ux + vx) / 2, y - (uy + vy) / 2), 20)
+
+    def test_label_bounds_cover_the_label(self):
+        for _ in range(100):
+            x, y = self.random.uniform(-500, 500), self.random.uniform(-500, 500)
+            width, height = self.random.uniform(0, 200), self.random.uniform(0, 50)
+            self.assertCoversLabel(label_bounds(x, y, width, height), x, y, width, height)
+
+    def test_moved_node_bounds_cover_the_old_and_new_drawings(self):
+        # Moving a node u linked to v, with labels, updates the union of the bounds before and after the move. That
+        # union should contain everything the full redraw would have changed.
+        radius, line_width, width, height = 20, 2, 30, 14
+        for ux, uy, vx, vy, du, dv, link_width in self.links(50):
+            nx, ny = self.random.uniform(-500, 500), self.random.uniform(-500, 500)
+            if math.hypot(vx - nx, vy - ny) < du + dv:
+                continue
+
+            def bounds(x, y):
+                lx, ly = label_position(x, y, vx, vy, 20)
+                return union_all([node_bounds(x, y, radius, line_width), label_bounds(x, y, width, height),
+                                  link_bounds(x, y, vx, vy, link_width, 10), label_bounds(lx, ly, width, height)])
+
+            rect = union_all([bounds(ux, uy), bounds(nx, ny)])
+            for x, y in ((ux, uy), (nx, ny)):
+                self.assertCoversNode(rect, x, y, radius, line_width)
+                self.assertCoversLabel(rect, x, y, width, height)
+                self.assertCoversLink(rect, x, y, vx, vy, du, dv, link_width, 10)
+                self.assertCoversLabel(rect, *label_position(x, y, vx, vy, 20), width, height)
+
+
+if __name__ == '__main__':
+
+    if CONCURRENTTEST:
+        suite = unittest.TestLoader().loadTestsFromTestCase(TestGeometry)
+        runner = unittest.TextTestRunner()
+        concurrent_suite = ConcurrentTestSuite(suite, fork_for_tests(50))
+        runner.run(concurrent_suite)
+    else:
+        unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from dynamicgraphviz.graph.directedgraph import DirectedGraph
+from dynamicgraphviz.graph.undirectedgraph import UndirectedGraph
+
+# The drawer is a Gtk window: those tests need PyGObject, pycairo and a display.
+DISPLAY = False
+try:
+    import gi
+    gi.require_version("Gtk", "3.0")
+    from gi.repository import Gdk
+    from dynamicgraphviz.gui.graphDrawer import GraphDrawer
+    DISPLAY = Gdk.Display.get_default() is not None
+except (ImportError, ValueError):
+    pass
+
+CONCURRENTTEST = False
+try:
+    from concurrencytest import ConcurrentTestSuite, fork_for_tests
+    CONCURRENTTEST = True
+except ImportError:
+    pass
+
+
+@unittest.skipUnless(DISPLAY, 'Gtk cannot open a window')
+class TestGraphDrawer(unittest.TestCase):
+
+    def close(self, g):
+        """Draw the graph g, close the drawer and return the callbacks unregistered from g while closing it."""
+        drawer = GraphDrawer(g)
+        removed = []
+        remove_callback = g.remove_callback
+
+        def spy(callback):
+            removed.append(callback)
+            remove_callback(callback)
+
+        g.remove_callback = spy
+        drawer.press_on_exit(drawer, None)
+        del g.remove_callback
+        return removed
+
+    def test_closing_the_drawer_removes_its_callbacks(self):
+        for g in (UndirectedGraph(), DirectedGraph()):
+            u = g.add_node()
+            v = g.add_node()
+            if g.directed:
+                g.add_arc(u, v)
+            else:
+                g.add_edge(u, v)
+
+            removed = self.close(g)
+            self.assertEqual(len(removed), 4)
+            self.assertEqual(len(set(removed)), 4)
+            self.assertEqual((g._on_add_node, g._on_remove_node, g._on_add_arc, g._on_remove_arc), ([], [], [], []))
+
+    def test_closing_a_drawer_keeps_the_callbacks_of_the_other_drawers(self):
+        g = UndirectedGraph()
+        g.add_node()
+        drawer = GraphDrawer(g)
+        removed = self.close(g)
+        self.assertEqual(len(g._on_add_node), 1)
+        self.assertNotIn(g._on_add_node[0], removed)
+        drawer.press_on_exit(drawer, None)
+        self.assertEqual(g._on_add_node, [])
+
+
+if __name__ == '__main__':
+
+    if CONCURRENTTEST:
+        suite = unittest.TestLoader().loadTestsFromTestCase(TestGraphDrawer)
+        runner = unittest.TextTestRunner()
+        concurrent_suite = ConcurrentTestSuite(suite, fork_for_tests(50))
+        runner.run(concurrent_suite)
+    else:
+        unittest.main()
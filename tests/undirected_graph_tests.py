@@ -244,6 +244,37 @@ class TestUndirectedGraph(unittest.TestCase):
         with self.assertRaises(LinkError):
             self.g.add_edge(v2, v1)
 
+    def test_add_edges_add_the_edges_to_edges_in_that_order(self):
+        n = 30
+        for _ in range(n):
+            self.g.add_node()
+
+        nodes = list(self.g)
+        couples = [(nodes[i], nodes[j]) for i in range(n) for j in range(i + 1, n)]
+        edges = self.g.add_edges(couples)
+
+        self.assertEqual(edges, list(self.g.edges))
+        self.assertEqual([e.extremities for e in edges], couples)
+        for u, v in couples:
+            self.assertTrue(u.is_neighbor_of(v))
+            self.assertTrue(v.is_neighbor_of(u))
+
+    def test_add_edges_raise_the_exceptions_of_add_edge(self):
+        v1 = self.g.add_node()
+        v2 = self.g.add_node()
+        v3 = self.g.add_node()
+        g2 = UndirectedGraph()
+        w = g2.add_node()
+        with self.assertRaises(GraphError):
+            self.g.add_edges([(v1, v2), (v3, v3)])
+        with self.assertRaises(TypeError):
+            self.g.add_edges([(v1, 1)])
+        with self.assertRaises(NodeMembershipError):
+            self.g.add_edges([(w, v1)])
+        with self.assertRaises(LinkError):
+            self.g.add_edges([(v2, v3), (v3, v2)])
+        self.assertEqual(self.g.nb_edges, 2)
+
     # REMOVE EDGE
 
     def test_remove_edge_decrease_size_of_edges_by_one(self):
@@ -562,6 +593,57 @@ class TestUndirectedGraph(unittest.TestCase):
         self.assertFalse(draw)  # !!
         self.currentedge = arc
 
+    def test_edits_call_the_registered_callbacks(self):
+        calls = []
+        self.g.on_add_node(lambda node, draw: calls.append(('add_node', node, draw)))
+        self.g.on_remove_node(lambda node, draw: calls.append(('remove_node', node, draw)))
+        self.g.on_add_arc(lambda arc, draw: calls.append(('add_arc', arc, draw)))
+        self.g.on_remove_arc(lambda arc, draw: calls.append(('remove_arc', arc, draw)))
+        u = self.g.add_node()
+        v = self.g.add_node()
+        w = self.g.add_node()
+        e1 = self.g.add_edge(u, v)
+        e2 = self.g.add_edge(v, w)
+        self.g.remove_edge(e1)
+        self.g.remove_node(v)
+        self.assertEqual(calls, [('add_node', u, True), ('add_node', v, True), ('add_node', w, True),
+                                 ('add_arc', e1, True), ('add_arc', e2, True), ('remove_arc', e1, True),
+                                 ('remove_arc', e2, False), ('remove_node', v, True)])
+
+    def test_remove_callback_stops_the_calls(self):
+        calls = []
+
+        def callback(node, draw):
+            calls.append(node)
+
+        self.g.on_add_node(callback)
+        self.g.on_remove_node(callback)
+        u = self.g.add_node()
+        self.g.remove_callback(callback)
+        self.g.add_node()
+        self.g.remove_node(u)
+        self.g.remove_callback(callback)
+        self.assertEqual(calls, [u])
+
+    def test_remove_node_when_a_listener_removes_another_node(self):
+        u = self.g.add_node()
+        v = self.g.add_node()
+        w = self.g.add_node()
+        x = self.g.add_node()
+        self.g.add_edge(u, v)
+        self.g.add_edge(w, x)
+
+        def remove_w(arc, draw):
+            if w in self.g:
+                self.g.remove_node(w)
+
+        self.g.on_remove_arc(remove_w)
+        self.g.remove_node(u)
+        self.assertEqual(list(self.g.nodes), [v, x])
+        self.assertEqual(self.g.nb_edges, 0)
+        self.assertEqual(v.nb_neighbors, 0)
+        self.assertEqual(x.nb_neighbors, 0)
+
     def test_remove_node_raise_TypeError_with_not_node(self):
         u = self.g.add_node()
         v = self.g.add_node()
@@ -603,6 +685,31 @@ class TestUndirectedGraph(unittest.TestCase):
         with self.assertRaises(NodeMembershipError):
             self.g.remove_node(v5)
 
+    # STR TESTS
+
+    def test_str_is_the_adjacency_matrix(self):
+        self.assertEqual(str(self.g2), '0 1 0 1 1 0 0 0\n'
+                                       '1 0 1 0 0 1 0 0\n'
+                                       '0 1 0 1 0 0 1 0\n'
+                                       '1 0 1 0 0 0 0 1\n'
+                                       '1 0 0 0 0 0 0 0\n'
+                                       '0 1 0 0 0 0 0 0\n'
+                                       '0 0 1 0 0 0 0 0\n'
+                                       '0 0 0 1 0 0 0 0')
+        self.assertEqual(str(self.g), '')
+
+    def test_str_is_updated_when_the_graph_is_edited(self):
+        v1, v2, v3, v4, v5, v6, v7, v8 = self.nodes
+        str(self.g2)
+        self.g2.remove_node(v2)
+        self.assertEqual(str(self.g2), '0 0 1 1 0 0 0\n'
+                                       '0 0 1 0 0 1 0\n'
+                                       '1 1 0 0 0 0 1\n'
+                                       '1 0 0 0 0 0 0\n'
+                                       '0 0 0 0 0 0 0\n'
+                                       '0 1 0 0 0 0 0\n'
+                                       '0 0 1 0 0 0 0')
+
 
 if __name__ == '__main__':
 